@@ -8,7 +8,9 @@ app/streamlit_msds_app.py
     · 리스트(요약만) — 기본값
     · 상세보기(파일별) — 각 파일은 expander(기본 접힘)
 - 섹션: 1, 2, 3, 9, 15 (섹션16은 컷오프에만 사용; wanted에는 포함 X)
-- 섹션3: 표 → 벤더 block4 → 제너릭 텍스트 파서(parse_sec3_generic) 순서로 시도
+- 섹션3: 텍스트 파서(벤더 block4 → 제너릭 parse_sec3_generic) 먼저 — CAS·함유량이 채워지지 않으면
+         표 → block4 → 제너릭 순서로 폴백(벤더 YAML tables.prefer_text_first: false면 처음부터 표 우선)
+- 섹션9: 항상 표 우선(pdfplumber → camelot), 표가 부족하면 라인 파서
 - 섹션15: 규제 매핑 색상(초록=regex/고점수, 노랑=fuzzy, 회색=미매핑)
 - 텍스트 추출 실패/OCR 실패 시 YAML 자동 생성 금지
 - Streamlit 중복 key/중첩 expander 오류 방지
@@ -17,10 +19,15 @@ app/streamlit_msds_app.py
 import os
 import re
 import sys
+import hashlib
 import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, Any, List, Tuple
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
@@ -32,51 +39,128 @@ ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 if ROOT_DIR not in sys.path:
     sys.path.insert(0, ROOT_DIR)
 
-from core.text_io import read_pdf_text
-from core.vendor_loader import (
-    load_vendor_yamls, pick_vendor_auto,
-    make_yaml_skeleton, save_vendor_yaml
-)
-from core.section_splitter import (
-    split_sections, sections_overview_df, pages_for_span_from_markers
-)
-from core.sec3_tables import (
-    trim_section3_with_vendor, extract_sec3_tables_yaml, extract_block4_from_text
-)
-from core.ident_extractor import extract_ident_fields
-from core.meta_extractors import extract_msds_no
-from core.sec9_physchem import extract_physchem_sec9
-from core.sec2_hazards import extract_sec2_hazards, pictogram_images
-from core.sec2_codes_only import list_h_p_codes, extract_signal_word
-from core.sec15_regulatory import extract_regulatory_items
-from core.reg_master_map import MASTER_LABELS
-from core.sec3_text_generic import parse_sec3_generic
+# 메인 프로세스 OCR(단일 파일)도 페이지별 tesseract를 동시에 띄우므로 각자 OpenMP 스레드는 1개
+#   — 앱 시작 시 1회만 설정, 사용자가 지정한 값은 유지
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
 
 st.set_page_config(page_title="MSDS Batch Extractor (1/2/3/9/15)", layout="wide")
 st.title("MSDS Batch Extractor — Sections 1, 2, 3, 9, 15")
 
-# 섹션 키
-WANTED_KEYS = {"1_identification", "2_hazards", "3_composition", "9_physical_chemical", "15_regulatory"}
-
 # 고정 옵션(체크박스 비노출)
-MIN_TEXT_CHARS = 80
 min_conf    = 80     # 패턴 라우터 최소 신뢰도
 auto_pick   = True
 auto_create = True   # 텍스트/섹션 충분 + 라우터 신뢰도 낮을 때만 스켈레톤 생성
 
-# 템플릿 로드
 VENDOR_DIR  = str(BASE_DIR / "templates" / "vendors")
-VENDOR_CFGS = load_vendor_yamls(VENDOR_DIR)
+
+# 상세보기 루프에서 반복 사용하는 정규식
+_WS_RE   = re.compile(r"\s+")
+_SAFE_RE = re.compile(r"[^\w\-]+")
+
+# 텍스트/섹션 캐시(PDF 내용 해시 → prepare_pdf 결과). 리런 간 공유, 최근 사용 순으로 상한 유지
+PREP_CACHE_MAX = 256
+
+# 요약 테이블 표시용 dtype
+_STATUS_DTYPE = pd.CategoricalDtype(categories=["✅", "⚠️", "—"])
+SUMMARY_DTYPES = {
+    "file": "string", "pattern": "string",
+    "router_pct": "int16", "extract_score": "int16",
+    "sec1": "int8", "sec2": "int8", "sec3": "int8", "sec9": "int8", "sec15": "int8",
+    "sec3_ok": _STATUS_DTYPE, "sec3_rows": "int32", "sec3_cas": "int32",
+    "reg_ok": _STATUS_DTYPE, "reg_rows": "int32",
+    "H_codes": "int32", "P_codes": "int32",
+    "product": "string", "msds_no": "string", "error": "string",
+}
+
+@st.cache_resource(show_spinner=False)
+def _prep_store() -> "OrderedDict[str, Dict[str, Any]]":
+    return OrderedDict()
+
+@st.cache_resource(show_spinner=False)
+def _cache_lock() -> threading.Lock:
+    """세션 간 공유 캐시(OrderedDict) 보호용 — 세션마다 스크립트가 별도 스레드에서 실행되므로
+    조회·삽입·축출은 이 락을 잡고 수행(파싱/추출 자체는 락 밖에서)."""
+    return threading.Lock()
+
+# 상세보기 표 캐시((내용 해시, 패턴) → (섹션3 표, 섹션9 표)). 리런 간 공유
+DETAIL_CACHE_MAX = 256
+
+@st.cache_resource(show_spinner=False)
+def _detail_store() -> "OrderedDict[Tuple[str, str], Tuple[pd.DataFrame, pd.DataFrame]]":
+    return OrderedDict()
+
+def _vendor_dir_sig(dir_path: str) -> Tuple[Tuple[str, int, int], ...]:
+    """템플릿 폴더 서명(파일명, mtime, 크기) — 폴더가 바뀌었을 때만 YAML 재파싱."""
+    sig = []
+    for p in Path(dir_path).glob("*.yaml"):
+        try:
+            stt = p.stat()
+            sig.append((p.name, stt.st_mtime_ns, stt.st_size))
+        except OSError:
+            continue
+    return tuple(sorted(sig))
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _load_vendors_cached(dir_path: str, sig: Tuple[Tuple[str, int, int], ...]) -> Dict[str, Dict[str, Any]]:
+    return load_vendor_yamls(dir_path)
+
+def _batch_tmpdir() -> str:
+    """세션 단위 임시 폴더. TemporaryDirectory가 세션 종료(GC)/프로세스 종료 시 자동 정리."""
+    if "_batch_tmp" not in st.session_state:
+        st.session_state["_batch_tmp"] = tempfile.TemporaryDirectory(prefix="msds_batch_")
+    return st.session_state["_batch_tmp"].name
+
+def _status_marks(ok: pd.Series, rows: pd.Series) -> np.ndarray:
+    return np.where(ok.to_numpy(dtype=bool), "✅", np.where(rows.to_numpy() > 0, "⚠️", "—"))
+
+def _summary_order(df: pd.DataFrame) -> np.ndarray:
+    """정렬 순서: error(내림차순) → router_pct → extract_score → file. np.lexsort 1회(마지막 키가 1순위)."""
+    err_rank = np.unique(df["error"].to_numpy(dtype=object).astype(str), return_inverse=True)[1]
+    return np.lexsort((
+        df["file"].to_numpy(dtype=object).astype(str),
+        df["extract_score"].to_numpy(),
+        df["router_pct"].to_numpy(),
+        -err_rank,
+    ))
+
+def _widget_keys(idx: int, digest: str, route: str, section_keys, preview_len: int) -> Dict[str, Any]:
+    """
+    파일별 위젯 key를 한 번에 생성(짧은 ASCII key).
+    text_area는 key가 없으면 라벨+본문 전체로 위젯 ID를 해시 → 명시 key로 대체.
+    key가 같으면 위젯 상태(표시 내용)가 유지되므로, 업로드 파일이 바뀌면 새 위젯이 되도록
+    파일 내용 digest와 적용 패턴(route)을 모든 key에 넣음. 미리보기 key에는 길이도 포함해 슬라이더 변경 시 갱신.
+    """
+    f = f"{idx}_{digest[:16]}_{route}"
+    return {
+        "chk_router": f"chk_router_{f}",
+        "ta_sect":    {k: f"ta_sect_{f}_{k}_{preview_len}" for k in section_keys},
+        "dl_txt":     {k: f"dl_txt_{f}_{k}" for k in section_keys},
+        "ta_product": f"ta_product_{f}",
+        "ta_address": f"ta_address_{f}",
+        "dl_sec2":    f"dl_sec2_{f}",
+        "dl_signal":  f"dl_signal_{f}",
+        "dl_sec3":    f"dl_sec3_{f}",
+        "dl_sec9":    f"dl_sec9_{f}",
+    }
 
 def _txt_bytes(s: str) -> bytes:
     return (s or "").encode("utf-8-sig")
 
-def _colorize_reg(row):
-    if row.get("match_source") == "regex" or row.get("match_score", 0) >= 90:
-        return ["background-color: #EAFFEA"] * len(row)
-    if row.get("match_source") == "fuzzy":
-        return ["background-color: #FFF6DA"] * len(row)
-    return ["background-color: #F2F2F2"] * len(row)
+@st.cache_data(show_spinner=False, max_entries=512)
+def _csv_bytes(df: pd.DataFrame) -> bytes:
+    """CSV 직렬화 + utf-8-sig 인코딩 1회. 같은 표면 리런/위젯 조작 시 캐시 재사용."""
+    return df.to_csv(index=False).encode("utf-8-sig")
+
+def _colorize_reg(df: pd.DataFrame) -> pd.DataFrame:
+    """행 색상을 벡터 연산으로 한 번에 계산해 전체 폭 스타일 표로 반환(Styler.apply axis=None용)."""
+    src = df["match_source"] if "match_source" in df.columns else pd.Series("", index=df.index)
+    score = pd.to_numeric(df["match_score"], errors="coerce").fillna(0) if "match_score" in df.columns else pd.Series(0, index=df.index)
+    colors = np.select(
+        [src.eq("regex").to_numpy() | score.ge(90).to_numpy(), src.eq("fuzzy").to_numpy()],
+        ["background-color: #EAFFEA", "background-color: #FFF6DA"],
+        default="background-color: #F2F2F2",
+    )
+    return pd.DataFrame(np.broadcast_to(colors[:, None], df.shape), index=df.index, columns=df.columns)
 
 # 사이드바
 st.sidebar.subheader("보기 옵션")
@@ -96,180 +180,123 @@ if not files:
     st.info("여러 PDF를 드래그&드롭하거나 'Browse files'로 선택하세요. 상단 요약 테이블이 먼저 생성됩니다.")
     st.stop()
 
-summary_rows: List[Dict[str, Any]] = []
-per_file_cache: List[Dict[str, Any]] = []
+# core 모듈(PyMuPDF/pdfplumber/rapidfuzz 등 네이티브 의존)은 업로드가 있을 때만 로드
+# → 파일 없는 리런(대기 화면)은 import 비용 없이 바로 그려짐
+from core.vendor_loader import (
+    load_vendor_yamls, make_yaml_skeleton, save_vendor_yaml
+)
+from core.section_splitter import sections_overview_df
+from core.sec3_tables import trim_section3_with_vendor
+from core.ident_extractor import extract_ident_fields
+from core.sec2_hazards import extract_sec2_hazards, pictogram_images
+from core.sec2_codes_only import list_h_p_codes, extract_signal_word
+from core.sec15_regulatory import extract_regulatory_items
+from core.reg_master_map import MASTER_LABELS
+from core.batch_pipeline import (
+    PREP_KEYS, SUMMARY_COLS, process_one_pdf, process_prepared_pdf,
+    route_pdf, wants_autocreate, summarize_pdf, section_pages, detail_tables
+)
+from core.text_io import ocr_pool_worker_init
 
-progress = st.progress(0, text="처리 중…")
-for idx, up in enumerate(files, start=1):
-    # 파일 저장
-    tmpdir = tempfile.mkdtemp(prefix=f"msds_{idx}_")
-    pdf_path = os.path.join(tmpdir, up.name)
-    with open(pdf_path, "wb") as f:
-        f.write(up.getbuffer())
-
-    # 텍스트 추출(OCR 폴백 포함)
-    try:
-        full_text = read_pdf_text(pdf_path) or ""
-        err = ""
-    except Exception as e:
-        full_text = ""
-        err = f"PDF 텍스트 추출 실패: {e}"
-
-    text_len = len("".join(full_text.split()))
-    has_page_marker = bool(re.search(r"---- PAGE\s+\d+\s+----", full_text))
-    parse_ok = (text_len >= MIN_TEXT_CHARS) and has_page_marker
-    fatal_error = err if err else ("" if parse_ok else "텍스트/마커 부족(OCR 포함)")
-
-    # 섹션 분리
-    sections_all, order_all, section_trims = {}, [], {}
-    if parse_ok:
-        try:
-            # split_sections 반환형 호환 처리
-            res = split_sections(full_text)
-            if isinstance(res, tuple) and len(res) == 4:
-                sections_all, _, order_all, section_trims = res
-            elif isinstance(res, tuple) and len(res) == 3:
-                sections_all, _, order_all = res
-                section_trims = {}
-            else:
-                # 예상치 못한 형식
-                sections_all = res if isinstance(res, dict) else {}
-                order_all = list(sections_all.keys())
-                section_trims = {}
-        except Exception as e:
-            fatal_error = f"섹션 분리 실패: {e}"
+# 프로세스 풀 크기 — 워커 안의 OCR 스레드는 CPU 수 // 워커 수로 제한(ocr_pool_worker_init)
+POOL_WORKERS = os.cpu_count() or 1
 
-    sections = {k: v for k, v in (sections_all or {}).items() if k in WANTED_KEYS}
+# 템플릿 로드(폴더 서명이 같으면 리런 간 재사용)
+vendor_sig  = _vendor_dir_sig(VENDOR_DIR)
+VENDOR_CFGS = _load_vendors_cached(VENDOR_DIR, vendor_sig)
 
-    # 라우팅
-    route = "_generic"
-    vinfo = {"score_pct": 0, "route_type": "pattern", "top_candidates": []}
-    if parse_ok:
-        try:
-            route, vinfo = pick_vendor_auto(full_text, VENDOR_CFGS, fallback_name="_generic", min_conf=min_conf)
-        except Exception:
-            pass
-
-    # 자동 생성(조건 만족 시만)
-    if parse_ok and auto_pick and auto_create:
-        ok_for_autocreate = bool(sections_all) and (route == "_generic" or vinfo.get("score_pct", 0) < min_conf)
-        if ok_for_autocreate:
+per_file_cache: List[Dict[str, Any]] = []
+
+# 파일 저장(메인 프로세스) → 워커에는 경로만 전달
+# 세션 공용 임시 폴더 1개, 파일명은 내용 해시 → 리런 시 같은 파일은 다시 쓰지 않음
+batch_dir = _batch_tmpdir()
+jobs: List[Tuple[int, str, str, str]] = []
+for idx, up in enumerate(files, start=1):
+    buf = up.getbuffer()
+    digest = hashlib.blake2b(buf, digest_size=16).hexdigest()
+    pdf_path = os.path.join(batch_dir, f"{digest}.pdf")
+    if not os.path.exists(pdf_path):
+        with open(pdf_path, "wb") as f:
+            f.write(buf)
+    jobs.append((idx, up.name, pdf_path, digest))
+
+# 파일별 처리(OCR/파싱) — 이미 처리한 내용(해시 동일)은 텍스트/섹션 재추출 생략
+prep_store = _prep_store()
+cache_lock = _cache_lock()
+results: List[Tuple[Tuple[Any, ...], Dict[str, Any]]] = [None] * len(jobs)
+misses: List[int] = []
+for i, (_, name, pdf_path, digest) in enumerate(jobs):
+    # 다른 세션이 사이에 축출할 수 있으므로 조회+LRU 갱신은 락 안에서 한 번에
+    with cache_lock:
+        prep = prep_store.get(digest)
+        if prep is not None:
+            prep_store.move_to_end(digest)
+    if prep is not None:
+        results[i] = process_prepared_pdf(dict(prep, pdf_path=pdf_path), name, VENDOR_CFGS, min_conf)
+    else:
+        misses.append(i)
+
+# 캐시 미스만 처리 — 2개 이상이면 프로세스 풀로 병렬 처리
+progress = st.progress(0, text="처리 중…")
+if len(misses) == 1:
+    _, name, pdf_path, _ = jobs[misses[0]]
+    results[misses[0]] = process_one_pdf(pdf_path, name, VENDOR_CFGS, min_conf)
+elif misses:
+    # 진행률은 약 5% 단위로만 갱신(파일마다 웹소켓 프레임 전송 방지)
+    step = max(1, len(misses) // 20)
+    with ProcessPoolExecutor(max_workers=POOL_WORKERS, initializer=ocr_pool_worker_init, initargs=(POOL_WORKERS,)) as ex:
+        futures = {
+            ex.submit(process_one_pdf, jobs[i][2], jobs[i][1], VENDOR_CFGS, min_conf): i
+            for i in misses
+        }
+        for done, fut in enumerate(as_completed(futures), start=1):
+            i = futures[fut]
             try:
-                skel = make_yaml_skeleton(sections_all, full_text)
+                results[i] = fut.result()
+            except Exception:
+                # 워커 비정상 종료 등 → 해당 파일만 메인 프로세스에서 재시도
+                _, name, pdf_path, _ = jobs[i]
+                results[i] = process_one_pdf(pdf_path, name, VENDOR_CFGS, min_conf)
+            if done % step == 0 or done == len(misses):
+                progress.progress(done / len(misses), text=f"처리 중… {done}/{len(misses)}")
+with cache_lock:
+    for i in misses:
+        prep_store[jobs[i][3]] = {k: results[i][1][k] for k in PREP_KEYS}
+    while len(prep_store) > PREP_CACHE_MAX:
+        prep_store.popitem(last=False)
+
+summary_rows: List[Tuple[Any, ...]] = [None] * len(jobs)
+for i, ((idx, name, _, digest), (row, cache)) in enumerate(zip(jobs, results)):
+    # 자동 생성(조건 만족 시만) — YAML 저장/재로드는 파일 순서대로 메인 프로세스에서만
+    if auto_pick and auto_create and cache.get("autocreate"):
+        route, vinfo = route_pdf(cache, VENDOR_CFGS, min_conf=min_conf)
+        if wants_autocreate(cache, route, vinfo, min_conf=min_conf):
+            try:
+                skel = make_yaml_skeleton(cache["sections_all"], cache["full_text"])
                 saved_path = save_vendor_yaml(skel, out_dir=VENDOR_DIR)
-                # 재로드/재라우팅
-                VENDOR_CFGS = load_vendor_yamls(VENDOR_DIR)
-                route, vinfo = pick_vendor_auto(full_text, VENDOR_CFGS, fallback_name="_generic", min_conf=min_conf)
+                # 폴더가 실제로 바뀐 경우에만 재로드/재라우팅
+                new_sig = _vendor_dir_sig(VENDOR_DIR)
+                if new_sig != vendor_sig:
+                    vendor_sig = new_sig
+                    VENDOR_CFGS = _load_vendors_cached(VENDOR_DIR, vendor_sig)
+                    route, vinfo = route_pdf(cache, VENDOR_CFGS, min_conf=min_conf)
                 # 알림은 요약 모드에서만 표시되도록 캡션은 생략
             except Exception:
                 pass
+        row, cache = summarize_pdf(name, cache, route, vinfo, VENDOR_CFGS)
 
-    # 섹션 채움 개수로 간단 추출 신뢰도
-    filled = sum(1 for k in WANTED_KEYS if sections.get(k, {}).get("text"))
-    extract_score = min(100, 20 * filled)
-
-    # 섹션2 코드 수
-    h_count = p_count = 0
-    if parse_ok:
-        sec2_text_probe = sections.get("2_hazards", {}).get("text", "") or sections_all.get("2_hazards", {}).get("text", "") or ""
-        scan_text = sec2_text_probe or full_text
-        try:
-            h_list, p_list = list_h_p_codes(scan_text)
-            h_count, p_count = len(h_list), len(p_list)
-        except Exception:
-            h_count = p_count = 0
-
-    # 섹션1 메타
-    ident_meta = {}
-    msds_no = ""
-    try:
-        sec1_text_probe = sections.get("1_identification", {}).get("text", "") or ""
-        ident_meta = extract_ident_fields(sec1_text_probe, full_text, VENDOR_CFGS.get(route, {})) if parse_ok else {}
-        msds_no = extract_msds_no(full_text, VENDOR_CFGS.get(route, {})) if parse_ok else ""
-    except Exception:
-        ident_meta = {}
-        msds_no = ""
-
-    # 요약용: 섹션3/섹션15 품질 지표
-    sec3_rows = sec3_cas = 0
-    sec3_ok = False
-    if parse_ok:
-        try:
-            sec3_text_probe = sections.get("3_composition", {}).get("text", "") or ""
-            if sec3_text_probe:
-                df_sec3_summary = parse_sec3_generic(sec3_text_probe)
-                if df_sec3_summary is not None and not df_sec3_summary.empty:
-                    sec3_rows = len(df_sec3_summary)
-                    sec3_cas  = df_sec3_summary["cas"].fillna("").ne("").sum() if "cas" in df_sec3_summary.columns else 0
-                    sec3_ok   = sec3_rows > 0 and sec3_cas > 0
-        except Exception:
-            pass
-
-    reg_rows = 0
-    reg_ok = False
-    if parse_ok:
-        try:
-            sec15_text_probe = sections.get("15_regulatory", {}).get("text", "") or ""
-            if sec15_text_probe:
-                reg_df = extract_regulatory_items(full_text, sec15_text_probe, VENDOR_CFGS.get(route, {}), MASTER_LABELS, min_score=82)
-                if reg_df is not None and not reg_df.empty:
-                    reg_rows = len(reg_df)
-                    if "match_source" in reg_df.columns:
-                        mapped_cnt = reg_df["match_source"].isin(["regex", "fuzzy"]).sum()
-                    else:
-                        mapped_cnt = reg_rows
-                    reg_ok = mapped_cnt > 0
-        except Exception:
-            pass
-
-    # 요약 행
-    summary_rows.append({
-        "file": up.name,
-        "pattern": route or "_generic",
-        "router_pct": int(vinfo.get("score_pct", 0)),
-        "extract_score": extract_score,
-        "sec1": int(bool(sections.get("1_identification", {}).get("text"))),
-        "sec2": int(bool(sections.get("2_hazards", {}).get("text"))),
-        "sec3": int(bool(sections.get("3_composition", {}).get("text"))),
-        "sec9": int(bool(sections.get("9_physical_chemical", {}).get("text"))),
-        "sec15": int(bool(sections.get("15_regulatory", {}).get("text"))),
-        "sec3_ok": "✅" if sec3_ok else ("⚠️" if sec3_rows > 0 else "—"),
-        "sec3_rows": sec3_rows,
-        "sec3_cas": sec3_cas,
-        "reg_ok": "✅" if reg_ok else ("⚠️" if reg_rows > 0 else "—"),
-        "reg_rows": reg_rows,
-        "H_codes": h_count,
-        "P_codes": p_count,
-        "product": ident_meta.get("product_name", "") if ident_meta else "",
-        "msds_no": msds_no or "",
-        "error": fatal_error,
-    })
+    summary_rows[i] = row
 
     # 상세보기 모드에서 사용할 캐시
     if compact_mode != "리스트(요약만)":
-        per_file_cache.append(dict(
-            idx=idx, up_name=up.name, pdf_path=pdf_path, full_text=full_text,
-            sections_all=sections_all, sections=sections, route=route, vinfo=vinfo
-        ))
-
-    progress.progress(idx / max(len(files), 1), text=f"처리 중… {idx}/{len(files)}")
+        per_file_cache.append(dict(cache, idx=idx, digest=digest))
 
 progress.empty()
 
 # 요약 테이블
 st.markdown("### 파일 요약(상태 한눈에 보기)")
-df_sum = pd.DataFrame(summary_rows)
-
-# 보기 좋은 컬럼 순서
-cols_order = [
-    "file", "pattern", "router_pct", "extract_score",
-    "sec1", "sec2", "sec3", "sec9", "sec15",
-    "sec3_ok", "sec3_rows", "sec3_cas",
-    "reg_ok", "reg_rows",
-    "H_codes", "P_codes",
-    "product", "msds_no", "error"
-]
-df_sum = df_sum[[c for c in cols_order if c in df_sum.columns]]
+# 컬럼 순서는 SUMMARY_COLS(보기 좋은 순서)
+df_sum = pd.DataFrame.from_records(summary_rows, columns=SUMMARY_COLS)
 
 # 필터링
 if show_only_problem:
@@ -277,21 +304,27 @@ if show_only_problem:
         (df_sum["error"] != "") |
         (df_sum["extract_score"] < 100) |
         (df_sum["router_pct"] < router_min_show) |
-        (df_sum["sec3_ok"] != "✅") |
-        (df_sum["reg_ok"] != "✅")
+        ~df_sum["sec3_ok"] |
+        ~df_sum["reg_ok"]
     )
     df_sum = df_sum[problem_mask]
 
-df_sum = df_sum.sort_values(
-    ["error", "router_pct", "extract_score", "file"],
-    ascending=[False, True, True, True]
-).reset_index(drop=True)
+# 상태 기호: ✅=정상, ⚠️=행은 있으나 미흡, —=없음
+df_sum = df_sum.assign(
+    sec3_ok=_status_marks(df_sum["sec3_ok"], df_sum["sec3_rows"]),
+    reg_ok=_status_marks(df_sum["reg_ok"], df_sum["reg_rows"]),
+)
+
+df_sum = df_sum.iloc[_summary_order(df_sum)].reset_index(drop=True)
+
+# 고정 스키마(명시 dtype) → st.dataframe의 Arrow 변환 시 object 컬럼 추론 생략
+df_sum = df_sum.astype(SUMMARY_DTYPES)
 
 st.dataframe(df_sum, use_container_width=True, hide_index=True)
 
 st.download_button(
     "CSV 다운로드(요약)",
-    data=df_sum.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig"),
+    data=_csv_bytes(df_sum),
     file_name="msds_summary.csv",
     use_container_width=True,
     key="dl_summary_csv"
@@ -304,6 +337,55 @@ if compact_mode == "리스트(요약만)":
 st.markdown("---")
 st.subheader("상세보기(파일별) — 기본 접힘")
 
+# 상세보기 표 추출(섹션3/9, pdfplumber 등) — 파일별 독립이므로 미스만 프로세스 풀로 병렬 처리
+# 렌더링(st.*)은 아래 루프에서 메인 스레드가 파일 순서대로
+detail_store = _detail_store()
+detail_jobs: Dict[Tuple[str, str], Tuple[Any, ...]] = {}
+# 이번 실행에서 쓸 결과는 지역 dict에 보관(표시 전에 다른 세션이 공유 캐시에서 축출해도 재계산 없음)
+detail_results: Dict[Tuple[str, str], Tuple[pd.DataFrame, pd.DataFrame]] = {}
+for rec in per_file_cache:
+    sections_all = rec["sections_all"] or {}
+    sections = rec["sections"] or {}
+    route = rec["route"] or "_generic"
+    rec["sec3_pages"] = section_pages(rec["full_text"], sections_all, sections, "3_composition")
+    rec["sec9_pages"] = section_pages(rec["full_text"], sections_all, sections, "9_physical_chemical")
+    rec["detail_key"] = dkey = (rec["digest"], route)
+    with cache_lock:
+        hit = detail_store.get(dkey)
+        if hit is not None:
+            detail_store.move_to_end(dkey)
+    if hit is not None:
+        detail_results[dkey] = hit
+    elif dkey not in detail_jobs:
+        detail_jobs[dkey] = (
+            rec["pdf_path"],
+            sections.get("3_composition", {}).get("text", "") or "",
+            rec["sec3_pages"],
+            sections.get("9_physical_chemical", {}).get("text", "") or "",
+            rec["sec9_pages"],
+            VENDOR_CFGS.get(route, {}),
+            rec.get("sec3_df"),
+        )
+
+if len(detail_jobs) == 1 or (os.cpu_count() or 1) == 1:
+    for dkey, args in detail_jobs.items():
+        detail_results[dkey] = detail_tables(*args)
+elif detail_jobs:
+    with st.spinner(f"상세 표 추출 중… ({len(detail_jobs)}개 파일)"):
+        with ProcessPoolExecutor(max_workers=POOL_WORKERS, initializer=ocr_pool_worker_init, initargs=(POOL_WORKERS,)) as ex:
+            futures = {ex.submit(detail_tables, *args): dkey for dkey, args in detail_jobs.items()}
+            for fut in as_completed(futures):
+                dkey = futures[fut]
+                try:
+                    detail_results[dkey] = fut.result()
+                except Exception:
+                    detail_results[dkey] = detail_tables(*detail_jobs[dkey])
+with cache_lock:
+    for dkey in detail_jobs:
+        detail_store[dkey] = detail_results[dkey]
+    while len(detail_store) > max(DETAIL_CACHE_MAX, len(per_file_cache)):
+        detail_store.popitem(last=False)
+
 for rec in per_file_cache:
     idx = rec["idx"]
     up_name = rec["up_name"]
@@ -313,11 +395,11 @@ for rec in per_file_cache:
     sections = rec["sections"] or {}
     route = rec["route"] or "_generic"
     vinfo = rec["vinfo"] or {}
+    wkeys = _widget_keys(idx, rec["digest"], route, sections.keys(), preview_len_global)
 
     with st.expander(f"{idx:02d}. {up_name}", expanded=False):
         # 상단 메트릭
-        sec_filled = sum(1 for k in WANTED_KEYS if sections.get(k, {}).get("text"))
-        extract_score = min(100, 20 * sec_filled)
+        extract_score = min(100, 20 * len(rec["filled_keys"]))
         c1, c2, c3, c4 = st.columns(4)
         c1.metric("선택된 패턴", route)
         c2.metric("YAML 라우터 신뢰도", f"{int(vinfo.get('score_pct', 0))}%")
@@ -328,7 +410,7 @@ for rec in per_file_cache:
         show_router = st.checkbox(
             "패턴 라우터 Top 후보(디버그) 보기",
             value=False,
-            key=f"chk_router_{idx}"
+            key=wkeys["chk_router"]
         )
         if show_router and vinfo.get("top_candidates"):
             box = st.container()
@@ -346,31 +428,35 @@ for rec in per_file_cache:
             title = (s.get("title") or k).strip()
             col = grid[i % 3]
             with col:
-                st.caption(re.sub(r"\s+"," ", title)[:120])
+                st.caption(_WS_RE.sub(" ", title)[:120])
                 st.text_area(
                     f"sect_{k}_{idx}",
                     value=(body[:preview_len_global] + ("…" if len(body) > preview_len_global else "")) or "(empty)",
-                    height=220, label_visibility="collapsed"
+                    height=220, label_visibility="collapsed",
+                    key=wkeys["ta_sect"][k]
                 )
-                safe = re.sub(r"[^\w\-]+","_", title)[:60]
+                safe = _SAFE_RE.sub("_", title)[:60]
                 st.download_button(
                     "TXT 다운로드",
                     data=_txt_bytes(body),
                     file_name=f"{os.path.splitext(up_name)[0]}__{safe}.txt",
                     use_container_width=True,
-                    key=f"dl_txt_{idx}_{k}"
+                    key=wkeys["dl_txt"][k]
                 )
 
         # 섹션1 메타
         st.markdown("#### 섹션1 핵심 메타")
         sec1_text = sections.get("1_identification", {}).get("text", "") or ""
-        ident_meta = extract_ident_fields(sec1_text, full_text, VENDOR_CFGS.get(route, {}))
+        ident_meta = rec.get("ident_meta")
+        if ident_meta is None:
+            ident_meta = extract_ident_fields(sec1_text, full_text, VENDOR_CFGS.get(route, {}),
+                                              sec1_end_offset=sections.get("1_identification", {}).get("end"))
         cA, cB, cC = st.columns(3)
         cA.metric("제품명", ident_meta.get("product_name") or "-")
         cB.metric("회사명", ident_meta.get("company") or "-")
         cC.metric("주소 길이", f"{len(ident_meta.get('address','')):,}")
-        st.text_area(f"제품명 전체_{idx}", value=ident_meta.get("product_name") or "-", height=60, label_visibility="collapsed")
-        st.text_area(f"주소_{idx}", value=ident_meta.get("address") or "-", height=110, label_visibility="collapsed")
+        st.text_area(f"제품명 전체_{idx}", value=ident_meta.get("product_name") or "-", height=60, label_visibility="collapsed", key=wkeys["ta_product"])
+        st.text_area(f"주소_{idx}", value=ident_meta.get("address") or "-", height=110, label_visibility="collapsed", key=wkeys["ta_address"])
 
         # 섹션2 유해·위험성
         st.markdown("#### 섹션2 — 유해·위험성")
@@ -397,67 +483,59 @@ for rec in per_file_cache:
         st.markdown("#### 섹션2 — H/P 코드 표")
         sec2_text = sections.get("2_hazards", {}).get("text", "") or sections_all.get("2_hazards", {}).get("text", "") or ""
         scan_text = sec2_text or full_text
-        h_list, p_list = list_h_p_codes(scan_text)
+        h_list, p_list = rec.get("h_list"), rec.get("p_list")
+        if h_list is None or p_list is None:
+            h_list, p_list = list_h_p_codes(scan_text)
         signal_word = extract_signal_word(scan_text)
         cH, cP, cS = st.columns(3)
         cH.metric("H codes", len(h_list))
         cP.metric("P codes", len(p_list))
         cS.metric("신호어", signal_word or "-")
 
-        rows = [{"type":"H","code":str(c)} for c in (h_list or [])] + [{"type":"P","code":str(c)} for c in (p_list or [])]
-        codes_df = pd.DataFrame(rows, columns=["type","code"])
-        if not codes_df.empty and {"type","code"}.issubset(codes_df.columns):
-            codes_df = codes_df.sort_values(["type","code"], ignore_index=True)
+        # 타입별로 미리 정렬해 열 단위로 생성(행 dict 목록 + sort_values 생략) — H가 P보다 앞
+        h_sorted = sorted(map(str, h_list or []))
+        p_sorted = sorted(map(str, p_list or []))
+        codes_df = pd.DataFrame({
+            "type": ["H"] * len(h_sorted) + ["P"] * len(p_sorted),
+            "code": h_sorted + p_sorted,
+        })
+        if not codes_df.empty:
             st.dataframe(codes_df, use_container_width=True, hide_index=True)
             st.download_button(
                 "CSV 다운로드 (섹션2 H/P + 신호어)",
-                data=codes_df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig"),
+                data=_csv_bytes(codes_df),
                 file_name=f"{os.path.splitext(up_name)[0]}__sec2_codes.csv",
                 use_container_width=True,
                 mime="text/csv",
-                key=f"dl_sec2_{idx}"
+                key=wkeys["dl_sec2"]
             )
         else:
             st.info("섹션2에서 H/P 코드를 찾지 못했습니다.")
 
         st.download_button(
             "TXT 다운로드 (신호어)",
-            data=(signal_word or "-").encode("utf-8-sig"),
+            data=_txt_bytes(signal_word or "-"),
             file_name=f"{os.path.splitext(up_name)[0]}__signal_word.txt",
             use_container_width=True,
             mime="text/plain",
-            key=f"dl_signal_{idx}"
+            key=wkeys["dl_signal"]
         )
 
         # 섹션3 — 조성
         st.markdown("#### 섹션3 표 추출 (CAS & 함유량)")
         sec3_text = sections.get("3_composition", {}).get("text", "") or ""
-        sec3_meta = sections_all.get("3_composition") or sections.get("3_composition") or {}
-        sec3_pages = pages_for_span_from_markers(
-            full_text,
-            sec3_meta.get("header_span", (0, 0))[0],
-            sec3_meta.get("end", 0)
-        ) if sec3_meta else []
+        sec3_pages = rec["sec3_pages"]
         st.caption(f"섹션3 추정 페이지: {sec3_pages or 'unknown'}")
 
-        df_tab = pd.DataFrame()
-        # 1) 표 파서
-        if sec3_text and sec3_pages:
-            df_tab = extract_sec3_tables_yaml(pdf_path, sec3_pages, VENDOR_CFGS.get(route, {}))
-        # 2) 벤더 block4
-        need_text_parse = df_tab.empty or ("conc_raw" in df_tab and df_tab["conc_raw"].fillna("").eq("").all())
-        if need_text_parse and sec3_text:
-            vendor_has_block4 = VENDOR_CFGS.get(route, {}).get("tables", {}).get("fallback") == "block4"
-            if vendor_has_block4:
-                df_tab = extract_block4_from_text(sec3_text, VENDOR_CFGS.get(route, {}))
-        # 3) 제너릭 텍스트 파서
-        if (df_tab.empty or ("conc_raw" in df_tab and df_tab["conc_raw"].fillna("").eq("").all())) and sec3_text:
-            try:
-                df_gen = parse_sec3_generic(sec3_text)
-                if not df_gen.empty:
-                    df_tab = df_gen
-            except Exception:
-                pass
+        # 섹션3: 텍스트 파서 우선(CAS·함유량 없으면 표 폴백) / 섹션9: 표 우선 — 결과는 위에서 미리 계산
+        detail = detail_results.get(rec["detail_key"])
+        if detail is None:
+            detail = detail_tables(
+                pdf_path, sec3_text, sec3_pages,
+                sections.get("9_physical_chemical", {}).get("text", "") or "", rec["sec9_pages"],
+                VENDOR_CFGS.get(route, {}), rec.get("sec3_df"),
+            )
+        df_tab, pc_df = detail
 
         if not df_tab.empty:
             keep_cols = [c for c in ["name", "alias", "cas", "conc_raw", "conc_repr"] if c in df_tab.columns]
@@ -469,39 +547,26 @@ for rec in per_file_cache:
             st.dataframe(df_tab, use_container_width=True, hide_index=True)
             st.download_button(
                 "CSV 다운로드 (섹션3)",
-                data=df_tab.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig"),
+                data=_csv_bytes(df_tab),
                 file_name=f"{os.path.splitext(up_name)[0]}__sec3.csv",
                 mime="text/csv",
                 use_container_width=True,
-                key=f"dl_sec3_{idx}"
+                key=wkeys["dl_sec3"]
             )
         else:
             st.info("섹션3 표/블록을 찾지 못했습니다.")
 
         # 섹션9 — 물리·화학
         st.markdown("#### 섹션9 표 추출 (물리·화학적 특성)")
-        sec9_text = sections.get("9_physical_chemical", {}).get("text", "") or ""
-        sec9_meta = sections_all.get("9_physical_chemical") or sections.get("9_physical_chemical") or {}
-        sec9_pages = pages_for_span_from_markers(
-            full_text,
-            sec9_meta.get("header_span",(0,0))[0],
-            sec9_meta.get("end",0)
-        ) if sec9_meta else []
-
-        pc_df = pd.DataFrame()
-        if sec9_pages:
-            pc_df = extract_physchem_sec9(pdf_path, sec9_pages, sec9_text)
-        elif sec9_text:
-            pc_df = extract_physchem_sec9(pdf_path, [], sec9_text)
         if not pc_df.empty:
             st.dataframe(pc_df, use_container_width=True, hide_index=True)
             st.download_button(
                 "CSV 다운로드 (섹션9)",
-                data=pc_df.to_csv(index=False, encoding="utf-8-sig").encode("utf-8-sig"),
+                data=_csv_bytes(pc_df),
                 file_name=f"{os.path.splitext(up_name)[0]}__sec9.csv",
                 mime="text/csv",
                 use_container_width=True,
-                key=f"dl_sec9_{idx}"
+                key=wkeys["dl_sec9"]
             )
         else:
             st.info("섹션9 표를 찾지 못했습니다.")
@@ -510,7 +575,9 @@ for rec in per_file_cache:
         st.markdown("#### 섹션15 규제 항목 매핑")
         sec15_text = sections.get("15_regulatory", {}).get("text", "") or ""
         try:
-            reg_df = extract_regulatory_items(full_text, sec15_text, VENDOR_CFGS.get(route, {}), MASTER_LABELS, min_score=82)
+            reg_df = rec.get("reg_df")
+            if reg_df is None:
+                reg_df = extract_regulatory_items(full_text, sec15_text, VENDOR_CFGS.get(route, {}), MASTER_LABELS, min_score=82)
         except Exception as e:
             reg_df = pd.DataFrame()
             st.warning(f"섹션15 매핑 중 오류: {e}")
@@ -518,9 +585,9 @@ for rec in per_file_cache:
         if not reg_df.empty:
             st.caption("색상: 초록=regex/고점수, 노랑=fuzzy, 회색=미매핑")
             try:
-                styled = reg_df.style.apply(_colorize_reg, axis=1)
+                styled = reg_df.style.apply(_colorize_reg, axis=None)
                 st.dataframe(styled, use_container_width=True, hide_index=True)
             except Exception:
-                st.write(reg_df.style.apply(_colorize_reg, axis=1))
+                st.write(reg_df.style.apply(_colorize_reg, axis=None))
         else:
             st.info("섹션15에서 규제 항목을 찾지 못했습니다.")
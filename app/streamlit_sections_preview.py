@@ -6,6 +6,8 @@
 import os
 import re
 import io
+import hashlib
+import tempfile
 import fitz  # PyMuPDF
 import streamlit as st
 import pandas as pd
@@ -15,21 +17,33 @@ st.title("MSDS Section Slicing Preview (1~16번 섹션 자르기)")
 
 # ---------- 유틸 ----------
 def read_pdf_text(pdf_path: str) -> str:
-    buf = []
     try:
         with fitz.open(pdf_path) as doc:
-            for i in range(len(doc)):
+            buf = [""] * len(doc)
+            # 페이지 이터레이터로 순회(인덱스별 load_page 호출 생략)
+            for i, page in enumerate(doc):
                 try:
-                    t = doc.load_page(i).get_text("text") or ""
+                    t = page.get_text("text") or ""
                 except Exception:
                     t = ""
                 # 페이지 구분자가 있어야 헤더 정규식이 더 잘 맞는다
-                buf.append(f"\n\n---- PAGE {i+1} ----\n{t}")
+                buf[i] = f"\n\n---- PAGE {i+1} ----\n{t}"
     except Exception as e:
         st.error(f"PDF 열기 실패: {e}")
         return ""
     return "\n".join(buf)
 
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_read_pdf_text(digest: str, _pdf_path: str) -> str:
+    """PDF 내용 해시 기준 캐시 — 슬라이더 조작 등 리런 시 텍스트 재추출 생략(경로는 해시 제외)."""
+    return read_pdf_text(_pdf_path)
+
+def _session_tmpdir() -> str:
+    """세션 단위 임시 폴더 1개. TemporaryDirectory가 세션 종료(GC)/프로세스 종료 시 자동 정리."""
+    if "_preview_tmp" not in st.session_state:
+        st.session_state["_preview_tmp"] = tempfile.TemporaryDirectory(prefix="msds_preview_")
+    return st.session_state["_preview_tmp"].name
+
 def to_txt_bytes(s: str) -> bytes:
     return (s or "").encode("utf-8-sig")
 
@@ -102,6 +116,89 @@ SECTION_PATTERNS = {
     ],
 }
 
+def _compile_section_patterns(patterns):
+    """섹션 키별 패턴을 한 번만 컴파일(잘못된 패턴은 제외)."""
+    out = {}
+    for key, pats in patterns.items():
+        compiled = []
+        for pat in pats:
+            try:
+                compiled.append(re.compile(pat, re.I | re.M))
+            except re.error:
+                continue
+        out[key] = compiled
+    return out
+
+SECTION_PATTERNS_C = _compile_section_patterns(SECTION_PATTERNS)
+
+_LEADING_FLAGS_RE = re.compile(r"^\(\?[aiLmsux]+\)")
+_WS_RE = re.compile(r"\s+")
+_LINE_HEAD = r"^\s*"
+
+def _build_section_alt(patterns):
+    """
+    전 섹션 패턴을 이름 있는 그룹 하나의 alternation으로 결합 → 본문 1회 스캔.
+    공통 접두(줄 시작 + 공백)는 밖으로 빼서 줄 시작에서만 분기를 시도.
+    그룹명 g{섹션순번}_{패턴순번} → (key, 패턴순번). 실패 시 None(개별 패턴 폴백).
+    """
+    parts, groups, first_chars = [], {}, set()
+    for ki, (key, pats) in enumerate(patterns.items()):
+        for pi, pat in enumerate(pats):
+            # 선행 인라인 플래그는 중간에 올 수 없으므로 제거(re.I|re.M로 통일)
+            body = _LEADING_FLAGS_RE.sub("", pat)
+            if not body.startswith(_LINE_HEAD):
+                return None, {}
+            body = body[len(_LINE_HEAD):]
+            # 본문 첫 글자(영숫자 리터럴)를 모아 선행 검사 → 헤더가 아닌 줄은 분기 시도 없이 통과
+            first_chars.add(body[:1] if body[:1].isalnum() else "")
+            name = f"g{ki}_{pi}"
+            parts.append(f"(?P<{name}>{body})")
+            groups[name] = (key, pi)
+    guard = ""
+    if "" not in first_chars:
+        guard = "(?=[" + "".join(sorted(re.escape(c) for c in first_chars)) + "])"
+    try:
+        return re.compile(_LINE_HEAD + guard + "(?:" + "|".join(parts) + ")", re.I | re.M), groups
+    except re.error:
+        return None, {}
+
+SECTION_ALT, SECTION_ALT_GROUPS = _build_section_alt(SECTION_PATTERNS)
+
+def _find_section_hits(text: str):
+    """
+    키별 첫 헤더 매치 (start, end, key, head) — 본문 위치순.
+    같은 키 안에서는 앞 패턴 우선.
+    """
+    if SECTION_ALT is None:
+        hits = []
+        for key, pats in SECTION_PATTERNS_C.items():
+            for pat in pats:
+                m = pat.search(text)
+                if m:
+                    hits.append((m.start(), m.end(), key, m.group(0)))
+                    break  # 같은 key에 대해 첫 매치만 사용
+        hits.sort(key=lambda x: x[0])  # 키별 개별 검색이라 위치순 정렬 필요
+        return hits
+
+    first = {}  # (key, 패턴순번) → 첫 매치
+    need = len(SECTION_PATTERNS)
+    done = 0
+    for m in SECTION_ALT.finditer(text):
+        kp = SECTION_ALT_GROUPS[m.lastgroup]
+        if kp not in first:
+            first[kp] = (m.start(), m.end(), kp[0], m.group(0))
+            if kp[1] == 0:
+                done += 1
+                if done == need:
+                    break  # 모든 키의 1순위 패턴이 잡히면 더 볼 필요 없음
+    # 키별로 잡힌 패턴 중 최우선 순번만 채택
+    best = {}
+    for key, pi in first:
+        if pi < best.get(key, pi + 1):
+            best[key] = pi
+    # first는 finditer 순(= 본문 위치순)으로 채워졌으므로 정렬 불필요
+    return [hit for (key, pi), hit in first.items() if best[key] == pi]
+
 def split_sections(text: str):
     """
     입력 텍스트에서 섹션 헤더를 탐지해 {key: {"title":..., "start":idx, "end":idx, "text":...}} 반환
@@ -112,25 +209,14 @@ def split_sections(text: str):
         return {}, [], []
 
     # 1) 헤더 위치 찾기
-    hits = []
-    for key, pats in SECTION_PATTERNS.items():
-        for pat in pats:
-            try:
-                m = re.search(pat, text, re.I | re.M)
-            except re.error:
-                continue
-            if m:
-                hits.append((m.start(), m.end(), key, m.group(0)))
-                break  # 같은 key에 대해 첫 매치만 사용
+    hits = _find_section_hits(text)
 
     logs = []
     if not hits:
         logs.append("[split] 헤더를 찾지 못함")
         return {}, logs, []
 
-    # 2) 위치 정렬
-    hits.sort(key=lambda x: x[0])  # start 기준
-    # 3) 구간화
+    # 2) 구간화(hits는 이미 위치순)
     sections = {}
     for i, (s, e, key, head) in enumerate(hits):
         nxt = hits[i+1][0] if i+1 < len(hits) else len(text)
@@ -143,7 +229,7 @@ def split_sections(text: str):
             "header_span": (s, e),
         }
     logs.append(f"[split] 감지된 섹션 수: {len(sections)}")
-    # 4) 순서
+    # 3) 순서
     order = [k for _,_,k,_ in hits]
     return sections, logs, order
 
@@ -159,14 +245,16 @@ for idx, up in enumerate(files, start=1):
     st.markdown("---")
     st.subheader(f"📄 {up.name}")
 
-    # 임시 저장
-    tmpdir = st.session_state.get("tmpdir") or os.getcwd()
-    path = os.path.join(tmpdir, f"__tmp_{idx}_{up.name}")
-    with open(path, "wb") as f:
-        f.write(up.getbuffer())
+    # 임시 저장 — 세션 폴더에 내용 해시 이름으로 1회만 기록(리런 시 재기록 생략, cwd 오염 없음)
+    buf = up.getbuffer()
+    digest = hashlib.blake2b(buf, digest_size=16).hexdigest()
+    path = os.path.join(_session_tmpdir(), f"{digest}.pdf")
+    if not os.path.exists(path):
+        with open(path, "wb") as f:
+            f.write(buf)
 
-    # 전체 텍스트
-    full_text = read_pdf_text(path)
+    # 전체 텍스트(같은 내용이면 캐시 사용)
+    full_text = _cached_read_pdf_text(digest, path)
     st.caption(f"전체 텍스트 길이: {len(full_text):,} chars")
     c1, c2 = st.columns([3,1])
     with c1:
@@ -189,7 +277,7 @@ for idx, up in enumerate(files, start=1):
         s = sections[k]
         rows.append({
             "key": k,
-            "title": re.sub(r"\s+", " ", s["title"])[:80],
+            "title": _WS_RE.sub(" ", s["title"])[:80],
             "start": s["start"],
             "end": s["end"],
             "length": len(s["text"]),
@@ -0,0 +1,350 @@
+# core/batch_pipeline.py
+# 파일 1개 처리(텍스트 추출 → 섹션 분리 → 라우팅 → 요약 지표)를 앱에서 분리한 순수 함수 모음
+#   - ProcessPoolExecutor 워커에서 호출되므로 모듈 최상위에 정의(피클 가능)
+#   - 디스크 쓰기(YAML 자동 생성)는 하지 않음 → 호출 측(메인 프로세스)에서 순차 처리
+
+import re
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .text_io import read_pdf_text
+from .vendor_loader import pick_vendor_auto
+from .section_splitter import split_sections, pages_for_span_from_markers
+from .sec3_tables import extract_sec3_tables_yaml, extract_block4_from_text
+from .sec9_physchem import extract_physchem_sec9
+from .ident_extractor import extract_ident_fields
+from .meta_extractors import extract_msds_no
+from .sec2_codes_only import list_h_p_codes
+from .sec15_regulatory import extract_regulatory_items
+from .reg_master_map import MASTER_LABELS
+from .sec3_text_generic import parse_sec3_generic
+
+# 섹션 키(섹션 번호 순) — 전체 섹션을 훑지 않고 이 키만 직접 조회
+WANTED_KEYS = ("1_identification", "2_hazards", "3_composition", "9_physical_chemical", "15_regulatory")
+MIN_TEXT_CHARS = 80
+
+_PAGE_MARKER_RE = re.compile(r"---- PAGE\s+\d+\s+----")
+_NONSPACE_RUN_RE = re.compile(r"\S+")
+
+# 요약 행 컬럼(순서 = 요약 테이블 표시 순서). 행은 dict 대신 이 순서의 tuple로 반환
+SUMMARY_COLS = (
+    "file", "pattern", "router_pct", "extract_score",
+    "sec1", "sec2", "sec3", "sec9", "sec15",
+    "sec3_ok", "sec3_rows", "sec3_cas",
+    "reg_ok", "reg_rows",
+    "H_codes", "P_codes",
+    "product", "msds_no", "error",
+)
+
+# prepare_pdf 결과 키(파일 내용에만 의존 → 내용 해시로 캐시 가능)
+PREP_KEYS = ("pdf_path", "full_text", "parse_ok", "fatal_error", "sections_all", "sections")
+
+
+def _nonempty_count(s: pd.Series) -> int:
+    """None/NaN/빈 문자열이 아닌 값 개수(임시 Series 없이 마스크 1회)."""
+    a = s.to_numpy(dtype=object)
+    return int((pd.notna(a) & (a != "")).sum())
+
+
+def _has_min_nonspace(s: str, n: int) -> bool:
+    """공백 제외 글자 수가 n 이상인지 — 리스트/문자열 재조립 없이 n에 도달하면 즉시 종료."""
+    if n <= 0:
+        return True
+    c = 0
+    for m in _NONSPACE_RUN_RE.finditer(s):
+        c += m.end() - m.start()
+        if c >= n:
+            return True
+    return False
+
+
+def prepare_pdf(pdf_path: str) -> Dict[str, Any]:
+    """텍스트 추출(OCR 폴백 포함) + 섹션 분리. 비용이 가장 큰 단계."""
+    try:
+        full_text = read_pdf_text(pdf_path) or ""
+        err = ""
+    except Exception as e:
+        full_text = ""
+        err = f"PDF 텍스트 추출 실패: {e}"
+
+    has_page_marker = _PAGE_MARKER_RE.search(full_text) is not None
+    parse_ok = _has_min_nonspace(full_text, MIN_TEXT_CHARS) and has_page_marker
+    fatal_error = err if err else ("" if parse_ok else "텍스트/마커 부족(OCR 포함)")
+
+    # 섹션 분리
+    sections_all = {}
+    if parse_ok:
+        try:
+            # split_sections 반환형 호환 처리
+            res = split_sections(full_text)
+            if isinstance(res, tuple) and len(res) in (3, 4):
+                sections_all = res[0]
+            else:
+                # 예상치 못한 형식
+                sections_all = res if isinstance(res, dict) else {}
+        except Exception as e:
+            fatal_error = f"섹션 분리 실패: {e}"
+
+    sections_all = sections_all or {}
+    sections = {k: sections_all[k] for k in WANTED_KEYS if k in sections_all}
+    return dict(
+        pdf_path=pdf_path, full_text=full_text, parse_ok=parse_ok, fatal_error=fatal_error,
+        sections_all=sections_all, sections=sections,
+    )
+
+
+def route_pdf(prep: Dict[str, Any], vendor_cfgs: Dict[str, Dict[str, Any]], min_conf: int = 80) -> Tuple[str, Dict[str, Any]]:
+    route = "_generic"
+    vinfo = {"score_pct": 0, "route_type": "pattern", "top_candidates": []}
+    if prep["parse_ok"]:
+        try:
+            route, vinfo = pick_vendor_auto(prep["full_text"], vendor_cfgs, fallback_name="_generic", min_conf=min_conf)
+        except Exception:
+            pass
+    return route, vinfo
+
+
+def wants_autocreate(prep: Dict[str, Any], route: str, vinfo: Dict[str, Any], min_conf: int = 80) -> bool:
+    """텍스트/섹션 충분 + 라우터 신뢰도 낮을 때만 스켈레톤 생성 대상."""
+    return bool(prep["parse_ok"] and prep["sections_all"]) and (route == "_generic" or vinfo.get("score_pct", 0) < min_conf)
+
+
+def summarize_pdf(
+    name: str,
+    prep: Dict[str, Any],
+    route: str,
+    vinfo: Dict[str, Any],
+    vendor_cfgs: Dict[str, Dict[str, Any]],
+) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+    """라우팅 결과를 받아 요약 행과 상세보기용 캐시를 만든다."""
+    full_text = prep["full_text"]
+    parse_ok = prep["parse_ok"]
+    sections_all = prep["sections_all"]
+    sections = prep["sections"]
+    vendor_cfg = vendor_cfgs.get(route, {})
+
+    # 섹션 채움 개수로 간단 추출 신뢰도
+    filled_keys = {k for k, v in sections.items() if isinstance(v, dict) and v.get("text")}
+    extract_score = min(100, 20 * len(filled_keys))
+
+    # 섹션2 코드 수
+    h_count = p_count = 0
+    h_list = p_list = None
+    if parse_ok:
+        sec2_text_probe = sections.get("2_hazards", {}).get("text", "") or sections_all.get("2_hazards", {}).get("text", "") or ""
+        scan_text = sec2_text_probe or full_text
+        try:
+            h_list, p_list = list_h_p_codes(scan_text)
+            h_count, p_count = len(h_list), len(p_list)
+        except Exception:
+            h_count = p_count = 0
+            h_list = p_list = None
+
+    # 섹션1 메타
+    ident_meta = {}
+    msds_no = ""
+    ident_cached = None
+    try:
+        sec1 = sections.get("1_identification", {})
+        sec1_text_probe = sec1.get("text", "") or ""
+        ident_meta = extract_ident_fields(sec1_text_probe, full_text, vendor_cfg,
+                                          sec1_end_offset=sec1.get("end")) if parse_ok else {}
+        msds_no = extract_msds_no(full_text, vendor_cfg) if parse_ok else ""
+        ident_cached = ident_meta if parse_ok else None
+    except Exception:
+        ident_meta = {}
+        msds_no = ""
+
+    # 요약용: 섹션3/섹션15 품질 지표
+    sec3_rows = sec3_cas = 0
+    sec3_ok = False
+    df_sec3_summary = None
+    if parse_ok:
+        try:
+            sec3_text_probe = sections.get("3_composition", {}).get("text", "") or ""
+            if sec3_text_probe:
+                df_sec3_summary = parse_sec3_generic(sec3_text_probe)
+                if df_sec3_summary is not None and not df_sec3_summary.empty:
+                    sec3_rows = len(df_sec3_summary)
+                    sec3_cas  = _nonempty_count(df_sec3_summary["cas"]) if "cas" in df_sec3_summary.columns else 0
+                    sec3_ok   = sec3_rows > 0 and sec3_cas > 0
+        except Exception:
+            pass
+
+    reg_rows = 0
+    reg_ok = False
+    reg_df = None
+    if parse_ok:
+        try:
+            sec15_text_probe = sections.get("15_regulatory", {}).get("text", "") or ""
+            if sec15_text_probe:
+                reg_df = extract_regulatory_items(full_text, sec15_text_probe, vendor_cfg, MASTER_LABELS, min_score=82)
+                if reg_df is not None and not reg_df.empty:
+                    reg_rows = len(reg_df)
+                    if "match_source" in reg_df.columns:
+                        mapped_cnt = int(np.isin(reg_df["match_source"].to_numpy(dtype=object), ("regex", "fuzzy")).sum())
+                    else:
+                        mapped_cnt = reg_rows
+                    reg_ok = mapped_cnt > 0
+        except Exception:
+            reg_df = None
+
+    # 요약 행 — SUMMARY_COLS 순서의 tuple(sec3_ok/reg_ok는 bool — 표시용 기호는 렌더링 시점에 매핑)
+    row = (
+        name,
+        route or "_generic",
+        int(vinfo.get("score_pct", 0)),
+        extract_score,
+        int("1_identification" in filled_keys),
+        int("2_hazards" in filled_keys),
+        int("3_composition" in filled_keys),
+        int("9_physical_chemical" in filled_keys),
+        int("15_regulatory" in filled_keys),
+        bool(sec3_ok),
+        sec3_rows,
+        sec3_cas,
+        bool(reg_ok),
+        reg_rows,
+        h_count,
+        p_count,
+        ident_meta.get("product_name", "") if ident_meta else "",
+        msds_no or "",
+        prep["fatal_error"],
+    )
+
+    # 상세보기 모드에서 사용할 캐시(요약 단계 결과 재사용; None이면 상세보기에서 새로 계산)
+    cache = dict(
+        prep, up_name=name, route=route, vinfo=vinfo, filled_keys=filled_keys,
+        ident_meta=ident_cached, h_list=h_list, p_list=p_list,
+        sec3_df=df_sec3_summary, reg_df=reg_df,
+    )
+    return row, cache
+
+
+def process_prepared_pdf(
+    prep: Dict[str, Any],
+    name: str,
+    vendor_cfgs: Dict[str, Dict[str, Any]],
+    min_conf: int = 80,
+) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+    """prepare_pdf 결과(캐시 포함)로부터 라우팅 + 요약."""
+    route, vinfo = route_pdf(prep, vendor_cfgs, min_conf=min_conf)
+    row, cache = summarize_pdf(name, prep, route, vinfo, vendor_cfgs)
+    cache["autocreate"] = wants_autocreate(prep, route, vinfo, min_conf=min_conf)
+    return row, cache
+
+
+def process_one_pdf(
+    pdf_path: str,
+    name: str,
+    vendor_cfgs: Dict[str, Dict[str, Any]],
+    min_conf: int = 80,
+) -> Tuple[Tuple[Any, ...], Dict[str, Any]]:
+    """
+    워커 진입점: PDF 1개 → (요약 행, 캐시).
+    캐시의 'autocreate'가 True면 호출 측에서 스켈레톤 생성 후 summarize_pdf로 다시 요약한다.
+    """
+    return process_prepared_pdf(prepare_pdf(pdf_path), name, vendor_cfgs, min_conf)
+
+
+# ---------- 상세보기 표 추출(pdfplumber 등 무거운 단계) ----------
+
+def section_pages(full_text: str, sections_all: Dict[str, Any], sections: Dict[str, Any], key: str) -> List[int]:
+    """섹션 구간이 걸친 페이지 번호 목록(마커 기준). 섹션이 없거나 본문이 비면 []."""
+    meta = (sections_all or {}).get(key) or (sections or {}).get(key) or {}
+    # 본문이 비면 텍스트 파서도 표 추출도 건질 게 없으므로 페이지 매핑 생략
+    if not meta or not meta.get("text"):
+        return []
+    return pages_for_span_from_markers(full_text, meta.get("header_span", (0, 0))[0], meta.get("end", 0))
+
+
+def _sec3_usable(df: pd.DataFrame) -> bool:
+    """행이 있고 conc_raw(있다면)에 빈 값이 아닌 항목이 하나라도 있으면 채택."""
+    if df.empty:
+        return False
+    if "conc_raw" not in df.columns:
+        return True
+    a = df["conc_raw"].to_numpy(dtype=object)
+    return bool((pd.notna(a) & (a != "")).any())
+
+
+def _prefer_text_first(vendor_cfg: Dict[str, Any]) -> bool:
+    """벤더 YAML tables.prefer_text_first(기본 True) — 섹션3 텍스트 파서가 충분하면 pdfplumber 생략.
+    섹션9는 라인 파서 품질이 표보다 낮아 이 플래그와 무관하게 표 우선."""
+    return bool((vendor_cfg.get("tables", {}) or {}).get("prefer_text_first", True))
+
+
+def extract_sec3_detail(
+    pdf_path: str,
+    sec3_text: str,
+    sec3_pages: List[int],
+    vendor_cfg: Dict[str, Any],
+    sec3_df: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    1) 표 파서 → 2) 벤더 block4 → 3) 제너릭 텍스트 파서 — 함유량이 채워진 첫 결과 채택.
+    텍스트 우선이면 2)/3)을 먼저 보고 CAS·함유량이 채워졌을 때 1)(PDF 재오픈)을 생략.
+    """
+    parsers = []
+    if sec3_text:
+        if sec3_pages:
+            parsers.append(("table", lambda: extract_sec3_tables_yaml(pdf_path, list(sec3_pages), vendor_cfg)))
+        if vendor_cfg.get("tables", {}).get("fallback") == "block4":
+            parsers.append(("block4", lambda: extract_block4_from_text(sec3_text, vendor_cfg)))
+        parsers.append(("generic", lambda: sec3_df if sec3_df is not None else parse_sec3_generic(sec3_text)))
+
+    results: Dict[str, Optional[pd.DataFrame]] = {}
+    def _run(name, parser):
+        if name not in results:
+            try:
+                results[name] = parser()
+            except Exception:
+                results[name] = None
+        return results[name]
+
+    if _prefer_text_first(vendor_cfg):
+        for name, parser in parsers:
+            if name == "table":
+                continue
+            df_try = _run(name, parser)
+            if (df_try is not None and _sec3_usable(df_try)
+                    and "cas" in df_try.columns and _nonempty_count(df_try["cas"]) > 0):
+                return df_try
+
+    # 기존 순서(텍스트 결과는 재사용)
+    df_tab = pd.DataFrame()
+    for name, parser in parsers:
+        df_try = _run(name, parser)
+        if df_try is None or df_try.empty:
+            continue
+        df_tab = df_try  # 함유량이 빈 결과는 다음 파서 실패 시 대체값으로 유지
+        if _sec3_usable(df_try):
+            break
+    return df_tab
+
+
+def extract_sec9_detail(pdf_path: str, sec9_pages: List[int], sec9_text: str) -> pd.DataFrame:
+    if not (sec9_pages or sec9_text):
+        return pd.DataFrame()
+    try:
+        return extract_physchem_sec9(pdf_path, list(sec9_pages), sec9_text)
+    except Exception:
+        return pd.DataFrame()
+
+
+def detail_tables(
+    pdf_path: str,
+    sec3_text: str,
+    sec3_pages: List[int],
+    sec9_text: str,
+    sec9_pages: List[int],
+    vendor_cfg: Dict[str, Any],
+    sec3_df: Optional[pd.DataFrame] = None,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """워커 진입점: 상세보기용 섹션3/섹션9 표 (df_sec3, df_sec9)."""
+    return (
+        extract_sec3_detail(pdf_path, sec3_text, sec3_pages, vendor_cfg, sec3_df),
+        extract_sec9_detail(pdf_path, sec9_pages, sec9_text),
+    )
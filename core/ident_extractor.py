@@ -1,6 +1,7 @@
 # core/ident_extractor.py
 import re
-from typing import Dict, List
+from functools import lru_cache
+from typing import Dict, List, Optional
 
 # 벤더 독립: 기본 패턴은 하드코딩, YAML에 있으면 '추가'만 허용
 PRODUCT_PATS_BASE: List[str] = [
@@ -14,33 +15,63 @@ ADDRESS_PATS_BASE: List[str] = [
     r"(?mis)^\s*(?:주소|Address)\s*[:：]\s*([\s\S]{5,}?)(?=\n\s*(?:TEL|전화|Fax|E-?mail|Homepage|Website|웹|홈페이지)\b|\n\s*\d+\.)",
 ]
 
+# 섹션1이 충분히 길고 뭔가 찾았으면 폴백은 섹션1 끝 + 여유분까지만 탐색
+SEC1_MIN_CHARS = 200
+FALLBACK_WINDOW = 4000
+
+# 결과 정리용
+_MULTISPACE_RE = re.compile(r"\s{2,}")
+_HSPACE_RE     = re.compile(r"[ \t\u00A0]+")
+
+@lru_cache(maxsize=None)
+def _compile(p: str) -> Optional["re.Pattern"]:
+    """기본/YAML 패턴 컴파일 캐시. 잘못된 패턴은 None."""
+    try:
+        return re.compile(p, re.M | re.I)
+    except re.error:
+        return None
+
+# 기본 패턴은 임포트 시 미리 컴파일
+for _p in PRODUCT_PATS_BASE + COMPANY_PATS_BASE + ADDRESS_PATS_BASE:
+    _compile(_p)
+
 def _first_hit(text: str, patterns: List[str]) -> str:
     for p in patterns:
-        try:
-            m = re.search(p, text, re.M | re.I)
-            if m:
-                # 캡처 그룹이 없으면 전체, 있으면 1번 그룹
-                return (m.group(1) if m.lastindex else m.group(0)).strip()
-        except re.error:
+        rx = _compile(p)
+        if rx is None:
             continue
+        m = rx.search(text)
+        if m:
+            # 캡처 그룹이 없으면 전체, 있으면 1번 그룹
+            return (m.group(1) if m.lastindex else m.group(0)).strip()
     return ""
 
+@lru_cache(maxsize=64)
+def _kv_patterns(key_labels: tuple) -> tuple:
+    """라벨 목록별 (같은 줄 값, 다음 줄 값) 패턴 — 라벨 조합마다 1회만 컴파일."""
+    lbl = r"(?:%s)" % "|".join(map(re.escape, key_labels))
+    return (
+        re.compile(rf"(?mi)^\s*{lbl}\s{{2,}}(.+)$"),
+        re.compile(rf"(?mi)^\s*{lbl}\s*$\s*^(.+)$"),
+    )
+
 def _kv_table_fallback(text: str, key_labels: List[str]) -> str:
     """
     좌:라벨/우:값 형태(표 추출/탭 간격/여러 공백)를 보수적으로 캐치.
     """
-    lbl = r"(?:%s)" % "|".join(map(re.escape, key_labels))
+    same_line, next_line = _kv_patterns(tuple(key_labels))
     # 한 줄에 라벨과 값이 2칸 이상 공백/탭으로 구분
-    m = re.search(rf"(?mi)^\s*{lbl}\s{2,}(.+)$", text)
+    m = same_line.search(text)
     if m:
         return m.group(1).strip()
     # 라벨 줄 다음에 값만 있는 형태
-    m = re.search(rf"(?mi)^\s*{lbl}\s*$\s*^(.+)$", text)
+    m = next_line.search(text)
     if m:
         return m.group(1).strip()
     return ""
 
-def extract_ident_fields(sec1_text: str, full_text: str, vendor_cfg: Dict) -> Dict:
+def extract_ident_fields(sec1_text: str, full_text: str, vendor_cfg: Dict,
+                         sec1_end_offset: Optional[int] = None) -> Dict:
     y = vendor_cfg or {}
     ident = y.get("identification") or {}
 
@@ -54,16 +85,22 @@ def extract_ident_fields(sec1_text: str, full_text: str, vendor_cfg: Dict) -> Di
     addr = _first_hit(sec1_text, address_pats)
 
     # 2) 섹션1에서 못 찾으면 문서 전체에서 폴백
+    #    섹션1이 정상 인식됐으면(길이 충분 + 필드 1개 이상) 섹션1 끝 근처까지만
+    #    → 15/16장 연락처 중복 오탐 방지, 긴 문서 전체 재탐색 생략
+    fallback_text = full_text or ""
+    if (sec1_end_offset is not None and len(sec1_text or "") > SEC1_MIN_CHARS
+            and (prod or comp or addr)):
+        fallback_text = fallback_text[:sec1_end_offset + FALLBACK_WINDOW]
     if not prod:
-        prod = _first_hit(full_text, product_pats) or _kv_table_fallback(full_text, ["제품명","Product name"])
+        prod = _first_hit(fallback_text, product_pats) or _kv_table_fallback(fallback_text, ["제품명","Product name"])
     if not comp:
-        comp = _first_hit(full_text, company_pats) or _kv_table_fallback(full_text, ["제조사","회사명","Manufacturer","Supplier"])
+        comp = _first_hit(fallback_text, company_pats) or _kv_table_fallback(fallback_text, ["제조사","회사명","Manufacturer","Supplier"])
     if not addr:
-        addr = _first_hit(full_text, address_pats)
+        addr = _first_hit(fallback_text, address_pats)
 
     # 노이즈 정리
-    prod = re.sub(r"\s{2,}", " ", prod or "").strip(" -:·•")
-    comp = re.sub(r"\s{2,}", " ", comp or "").strip(" -:·•")
-    addr = re.sub(r"[ \t\u00A0]+", " ", addr or "").strip()
+    prod = _MULTISPACE_RE.sub(" ", prod or "").strip(" -:·•")
+    comp = _MULTISPACE_RE.sub(" ", comp or "").strip(" -:·•")
+    addr = _HSPACE_RE.sub(" ", addr or "").strip()
 
     return {"product_name": prod, "company": comp, "address": addr}
@@ -1,4 +1,24 @@
 import re
+from functools import lru_cache
+
+# 내장 폴백 패턴(우선순위 순)
+_AA_NO_RX    = re.compile(r"\bAA\d{5}-\d{10}\b")
+_LABEL_NO_RX = re.compile(r"(?i)\b(?:MSDS|SDS)\s*(?:관리번호|No\.?|번호|#)\s*[:：]?\s*([A-Z0-9\-]{10,})")
+_LOOSE_NO_RX = re.compile(r"\b[A-Z0-9]{2,}-[A-Z0-9]{6,}\b")
+_PAGE2_RX    = re.compile(r"---- PAGE\s+2\s+----")
+
+@lru_cache(maxsize=None)
+def _compile_vendor(p: str):
+    """YAML msds_no_patterns 컴파일 캐시. 잘못된 패턴은 None."""
+    try:
+        return re.compile(p, re.I)
+    except re.error:
+        return None
+
+def _head_text(txt: str) -> str:
+    """첫 페이지(---- PAGE 2 ---- 이전). 마커가 없으면 전체."""
+    m = _PAGE2_RX.search(txt)
+    return txt[:m.start()] if m else txt
 
 def extract_msds_no(full_text: str, vendor_cfg: dict) -> str:
     txt = full_text or ""
@@ -6,20 +26,22 @@ def extract_msds_no(full_text: str, vendor_cfg: dict) -> str:
     pats = y.get("msds_no_patterns") or []
 
     for p in pats:
-        try:
-            m = re.search(p, txt, re.I)
-        except re.error:
-            m = None
+        rx = _compile_vendor(p)
+        m = rx.search(txt) if rx is not None else None
         if m:
             return (m.group(1) if m.lastindex else m.group(0)).strip()
 
-    m = re.search(r"\bAA\d{5}-\d{10}\b", txt)
+    # 내장 폴백은 첫 페이지(문서 머리말)에서만 — 관리번호는 1페이지 상단에 표기됨
+    #   → 못 찾는 문서도 전체 문서를 3번 훑지 않고, 본문의 'NON-AEROSOL' 같은 오탐도 방지
+    head = _head_text(txt)
+
+    m = _AA_NO_RX.search(head)
     if m: return m.group(0)
 
-    m = re.search(r"(?i)\b(?:MSDS|SDS)\s*(?:관리번호|No\.?|번호|#)\s*[:：]?\s*([A-Z0-9\-]{10,})", txt)
+    m = _LABEL_NO_RX.search(head)
     if m: return m.group(1).strip()
 
-    m = re.search(r"\b[A-Z0-9]{2,}-[A-Z0-9]{6,}\b", txt)
+    m = _LOOSE_NO_RX.search(head)
     if m: return m.group(0)
 
     return ""
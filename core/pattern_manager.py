@@ -1,21 +1,56 @@
 # -*- coding: utf-8 -*-
-import os, re, json, glob
-from typing import Dict, Any, Tuple, List
+import os, re, json
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple, List
 from pathlib import Path
 import yaml
 
+# libyaml(C) 로더가 있으면 사용(순수 파이썬 파서 대비 수 배 빠름)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+# 경로 → (mtime_ns, size, 파싱 결과). 파일이 바뀌지 않았으면 재파싱 생략
+_YAML_CACHE: Dict[str, Tuple[int, int, Any]] = {}
+
+def load_yaml_cached(path: str, st: Optional[os.stat_result] = None) -> Any:
+    """YAML 파일 로드(mtime/size 기준 캐시). 결과 dict는 호출자 간 공유되므로 수정 금지."""
+    st = st or os.stat(path)
+    hit = _YAML_CACHE.get(path)
+    if hit and hit[0] == st.st_mtime_ns and hit[1] == st.st_size:
+        return hit[2]
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.load(f, Loader=_YAML_LOADER)
+    _YAML_CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+def iter_yaml_entries(dir_path: str, prefix: str = "", exts: Tuple[str, ...] = (".yaml",)):
+    """폴더 내 YAML 파일 DirEntry(scandir 1회, 숨김 파일 제외 — glob '*.yaml'과 동일)."""
+    try:
+        with os.scandir(dir_path) as it:
+            for e in it:
+                if e.name.startswith(".") or not e.name.startswith(prefix) or not e.name.endswith(exts):
+                    continue
+                yield e
+    except OSError:
+        return
+
 def load_pattern_yamls(dir_path: str) -> Dict[str, Dict[str, Any]]:
     patterns = {}
-    for p in glob.glob(os.path.join(dir_path, "*.yaml")):
+    for e in iter_yaml_entries(dir_path):
         try:
-            with open(p, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
-            name = data.get("name") or os.path.splitext(os.path.basename(p))[0]
+            data = load_yaml_cached(e.path, e.stat()) or {}
+            name = data.get("name") or os.path.splitext(e.name)[0]
             patterns[name] = data
         except Exception:
             continue
     return patterns
 
+@lru_cache(maxsize=None)
+def _compile_detect(p: str) -> Optional["re.Pattern"]:
+    """detect 패턴 컴파일 캐시(파일×패턴마다 재컴파일 방지). 잘못된 패턴은 None."""
+    try:
+        return re.compile(p, re.I | re.M)
+    except re.error:
+        return None
+
 def _ratio(hit: int, tot: int) -> float:
     return 0.0 if tot <= 0 else 100.0 * hit / float(tot)
 
@@ -28,18 +63,14 @@ def score_pattern(text_norm: str, cfg: Dict[str, Any]) -> Tuple[float, Dict[str,
 
     for p in core:
         details["core_tot"] += 1
-        try:
-            if re.search(p, text_norm, re.I | re.M):
-                details["core_hit"] += 1
-        except re.error:
-            pass
+        rx = _compile_detect(p)
+        if rx is not None and rx.search(text_norm):
+            details["core_hit"] += 1
     for p in seed:
         details["seed_tot"] += 1
-        try:
-            if re.search(p, text_norm, re.I | re.M):
-                details["seed_hit"] += 1
-        except re.error:
-            pass
+        rx = _compile_detect(p)
+        if rx is not None and rx.search(text_norm):
+            details["seed_hit"] += 1
 
     # 간단 가중 평균
     core_pct = _ratio(details["core_hit"], details["core_tot"])
@@ -64,8 +95,8 @@ def pick_pattern_auto(text_norm: str, cfgs: Dict[str, Dict[str, Any]], fallback_
 def next_pattern_name(out_dir: str, prefix: str="pattern_", digits: int=4) -> str:
     Path(out_dir).mkdir(parents=True, exist_ok=True)
     nums = []
-    for p in glob.glob(os.path.join(out_dir, f"{prefix}*.yaml")):
-        base = os.path.splitext(os.path.basename(p))[0]
+    for e in iter_yaml_entries(out_dir, prefix=prefix):
+        base = os.path.splitext(e.name)[0]
         tail = base.replace(prefix, "")
         if tail.isdigit():
             nums.append(int(tail))
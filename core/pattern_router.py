@@ -1,6 +1,6 @@
 # core/pattern_router.py
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from rapidfuzz import fuzz, process  # pip install rapidfuzz
 from .pattern_store import load_patterns, save_pattern
 
@@ -24,13 +24,28 @@ TABLE3_HINTS = {
     "conc": ["함유", "함량", "농도", "conc", "concentration", "%"]
 }
 
+# 섹션3 표 헤더 후보 토큰 — 단어 토큰은 단어 집합과 교집합 1회(\b토큰\b 검색과 동일)
+_HEAD_TOKENS = ["성분","물질명","관용명","name","chemical","cas","식별","함유","함량","농도","concentration","%"]
+_HEAD_WORDS = frozenset(t.lower() for t in _HEAD_TOKENS if t != "%")
+_WORD_RX = re.compile(r"\w+")
+# '%'는 비단어 문자라 \b%\b = 앞뒤가 모두 단어 문자인 경우
+_PCT_RX = re.compile(r"(?<=\w)%(?=\w)")
+_NL_RX = re.compile(r"\r?\n")
+
 def _gather_lines(text: str, start: int, end: int, radius_lines: int = 20) -> List[str]:
-    # 섹션 타이틀 부근 일부 줄만 떼어 추출
-    sub = text[max(0, start):min(len(text), end)]
-    lines = re.split(r"\r?\n", sub)
-    # 너무 길어지면 앞뒤 제한
-    if len(lines) > radius_lines:
-        lines = lines[:radius_lines]
+    # 섹션 타이틀 부근 일부 줄만 떼어 추출 — 구간 전체를 복사·분할하지 않고 앞쪽 radius_lines 줄만 잘라냄
+    pos, end, _ = slice(max(0, start), min(len(text), end)).indices(len(text))
+    end = max(pos, end)
+    lines: List[str] = []
+    if radius_lines < 1:
+        return lines
+    for m in _NL_RX.finditer(text, pos, end):
+        lines.append(text[pos:m.start()])
+        pos = m.end()
+        if len(lines) >= radius_lines:
+            break
+    else:
+        lines.append(text[pos:end])
     return [l.strip() for l in lines if l.strip()]
 
 def analyze_layout_from_sections(full_text: str, sections: Dict[str, dict]) -> dict:
@@ -43,9 +58,10 @@ def analyze_layout_from_sections(full_text: str, sections: Dict[str, dict]) -> d
     t3_text = t3.get("text","") or ""
     t3_head_snip = "\n".join(_gather_lines(full_text, t3.get("start",0), t3.get("end",0), radius_lines=40)) if t3 else ""
     head_cands = set()
-    for token in ["성분","물질명","관용명","name","chemical","cas","식별","함유","함량","농도","concentration","%"]:
-        if re.search(rf"(?i)\b{re.escape(token)}\b", t3_head_snip) or re.search(rf"(?i)\b{re.escape(token)}\b", t3_text[:400]):
-            head_cands.add(token.lower())
+    for snip in (t3_head_snip, t3_text[:400]):
+        head_cands.update(_HEAD_WORDS.intersection(_WORD_RX.findall(snip.lower())))
+        if _PCT_RX.search(snip):
+            head_cands.add("%")
 
     pattern = {
         "pattern_id": None,  # save_pattern에서 부여
@@ -73,46 +89,56 @@ def analyze_layout_from_sections(full_text: str, sections: Dict[str, dict]) -> d
     }
     return pattern
 
-def _section_score(text: str, pattern: dict, sections: Dict[str, dict]) -> float:
+def _doc_view(sections: Dict[str, dict]) -> dict:
+    """문서별 불변값(섹션 키 집합, 소문자 스니펫, 섹션3 창) — 패턴마다 다시 만들지 않도록 1회 계산."""
+    snips = {k: ((s or {}).get("title","") + "\n" + ((s or {}).get("text","")[:300] or "")).lower()
+             for k, s in sections.items()}
+    sec3 = sections.get("3_composition")
+    window = (sec3.get("title","") + "\n" + sec3.get("text","")[:800]).lower() if sec3 else None
+    return {"have": frozenset(sections), "snips": snips, "sec3_window": window}
+
+def _section_score(text: str, pattern: dict, sections: Dict[str, dict], view: Optional[dict] = None) -> float:
     # 관측 섹션 목록과 패턴 detect.sections의 교집합 비율
     want = set((pattern.get("detect",{}).get("sections") or []))
     if not want:
         return 0.0
-    have = set(sections.keys())
-    base = len(want.intersection(have)) / max(1,len(want))
+    view = view or _doc_view(sections)
+    base = len(want.intersection(view["have"])) / max(1,len(want))
     # 힌트 키워드 보너스: 각 섹션 타이틀/초반 텍스트에 힌트가 있으면 가점
     bonus = 0.0
     hints = pattern.get("detect",{}).get("section_hints") or {}
+    snips = view["snips"]
     for k in want:
-        s = sections.get(k, {})
-        snip = (s.get("title","") + "\n" + (s.get("text","")[:300] or "")).lower()
+        snip = snips.get(k, "\n")
         for kw in (hints.get(k) or []):
             if kw.lower() in snip:
                 bonus += 0.02
                 break
     return min(1.0, base + bonus)
 
-def _table3_score(text: str, pattern: dict, sections: Dict[str, dict]) -> float:
-    sec3 = sections.get("3_composition")
-    if not sec3:
+def _table3_score(text: str, pattern: dict, sections: Dict[str, dict], view: Optional[dict] = None) -> float:
+    view = view or _doc_view(sections)
+    window = view["sec3_window"]
+    if window is None:
         return 0.0
-    window = (sec3.get("title","") + "\n" + sec3.get("text","")[:800]).lower()
     toks = set([t.lower() for t in pattern.get("tables",{}).get("sec3",{}).get("header_tokens",[])])
     if not toks:
         return 0.0
     hit = sum(1 for t in toks if t in window)
     return hit / max(1, len(toks))
 
-def score_pattern(full_text: str, pattern: dict, sections: Dict[str, dict]) -> float:
-    a = _section_score(full_text, pattern, sections)
-    b = _table3_score(full_text, pattern, sections)
+def score_pattern(full_text: str, pattern: dict, sections: Dict[str, dict], view: Optional[dict] = None) -> float:
+    view = view or _doc_view(sections)
+    a = _section_score(full_text, pattern, sections, view)
+    b = _table3_score(full_text, pattern, sections, view)
     return round(100.0 * (W_SECTIONS*a + W_TABLE3*b), 1)
 
 def route_pattern_auto(full_text: str, sections: Dict[str,dict], all_patterns: Dict[str,dict], min_conf: int = 80, on_miss_create: bool = True):
     # 가장 높은 스코어의 패턴 선택, 미달 시 새 패턴 생성
     best_id, best_conf = None, -1.0
+    view = _doc_view(sections)  # 문서 불변값은 패턴 수와 무관하게 1회만
     for pid, p in all_patterns.items():
-        sc = score_pattern(full_text, p, sections)
+        sc = score_pattern(full_text, p, sections, view)
         if sc > best_conf:
             best_id, best_conf = pid, sc
     info = {
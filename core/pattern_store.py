@@ -1,8 +1,11 @@
 # core/pattern_store.py
 import os, re, json, yaml
 from typing import Dict, List, Tuple
+from .pattern_manager import load_yaml_cached, iter_yaml_entries
 
 PATTERN_DIR_DEFAULT = "templates/patterns"
+_YAML_EXTS = (".yml", ".yaml")
+_PATTERN_ID_RE = re.compile(r"pattern_(\d{4})\.ya?ml$", re.I)
 
 def ensure_dir(d: str):
     os.makedirs(d, exist_ok=True)
@@ -11,7 +14,7 @@ def next_pattern_id(pattern_dir: str) -> str:
     ensure_dir(pattern_dir)
     max_n = 0
     for fn in os.listdir(pattern_dir):
-        m = re.match(r"pattern_(\d{4})\.ya?ml$", fn, re.I)
+        m = _PATTERN_ID_RE.match(fn)
         if m:
             max_n = max(max_n, int(m.group(1)))
     return f"pattern_{max_n+1:04d}"
@@ -19,14 +22,12 @@ def next_pattern_id(pattern_dir: str) -> str:
 def load_patterns(pattern_dir: str = PATTERN_DIR_DEFAULT) -> Dict[str, dict]:
     ensure_dir(pattern_dir)
     patterns = {}
-    for fn in os.listdir(pattern_dir):
-        if not fn.lower().endswith((".yml",".yaml")): 
-            continue
-        path = os.path.join(pattern_dir, fn)
+    with os.scandir(pattern_dir) as it:
+        entries = [e for e in it if e.name.lower().endswith(_YAML_EXTS)]
+    for e in entries:
         try:
-            with open(path, "r", encoding="utf-8") as f:
-                y = yaml.safe_load(f) or {}
-            pid = y.get("pattern_id") or os.path.splitext(fn)[0]
+            y = load_yaml_cached(e.path, e.stat()) or {}
+            pid = y.get("pattern_id") or os.path.splitext(e.name)[0]
             patterns[pid] = y
         except Exception:
             continue
@@ -47,6 +48,6 @@ def list_pattern_files(pattern_dir: str = PATTERN_DIR_DEFAULT) -> List[str]:
     ensure_dir(pattern_dir)
     out = []
     for fn in sorted(os.listdir(pattern_dir)):
-        if fn.lower().endswith((".yaml",".yml")):
+        if fn.lower().endswith(_YAML_EXTS):
             out.append(fn)
     return out
@@ -3,8 +3,11 @@
 
 from __future__ import annotations
 import re
+import string
 import unicodedata
+from functools import lru_cache
 from typing import List, Tuple, Dict, Optional
+import numpy as np
 
 try:
     # 속도/정확도 우수
@@ -30,15 +33,20 @@ MASTER_LABELS: List[str] = [
 
 # 불릿/중점/공백 계열
 _BULLETS = r'[\s\u00A0\u2007\u202F\u2060\u00B7\u2022\u2219\u2027\u30FB·•ㆍ∙‧・]+'
+_BULLETS_RX  = re.compile(_BULLETS)
+_BRACKETS_RX = re.compile(r'[【】\[\]{}<>〈〉()（）]')
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
 
+@lru_cache(maxsize=4096)
 def normalize_label(s: str) -> str:
+    """같은 라벨이 문서마다 반복되므로 결과 캐시."""
     if not s:
         return ""
     s = unicodedata.normalize("NFKC", s)
-    s = re.sub(_BULLETS, '', s)         # 불릿/공백류 제거
-    s = re.sub(r'[【】\[\]{}<>〈〉()（）]', '', s)  # 괄호류 제거(내용까지 지우진 않음)
+    s = _BULLETS_RX.sub('', s)          # 불릿/공백류 제거
+    s = _BRACKETS_RX.sub('', s)         # 괄호류 제거(내용까지 지우진 않음)
     # 영문만 소문자화
-    s = ''.join(ch.lower() if 'A' <= ch <= 'Z' else ch for ch in s)
+    s = s.translate(_ASCII_LOWER)
     return s.strip()
 
 # 변형을 넓게 흡수하는 우선 정규식(정규화 전/후 둘 다 검사)
@@ -51,6 +59,8 @@ REGEX_MAP: List[Tuple[str, str]] = [
     (r'유독\s*물질', '유독물질'),
     (r'지정\s*폐기\s*물', '지정폐기물'),
 ]
+# 라벨마다 호출되므로 모듈 로드 시 1회 컴파일
+REGEX_MAP_C: List[Tuple["re.Pattern", str]] = [(re.compile(p, re.I), canon) for p, canon in REGEX_MAP]
 
 # 룰 기반 보정(정규식/완전일치 실패시)
 def post_map_rules(norm: str) -> Optional[Tuple[str, int, str]]:
@@ -72,12 +82,24 @@ def build_master_index(master: List[str]) -> Dict[str, str]:
     return idx
 
 _MASTER_IDX = build_master_index(MASTER_LABELS)
+_MASTER_KEYS = list(_MASTER_IDX.keys())
+# 마스터 라벨에 쓰인 문자 전체 — 공통 문자가 하나도 없으면 모든 fuzzy 점수가 0이므로 스코어링 생략
+_MASTER_CHARS = frozenset("".join(_MASTER_KEYS))
+# 정규화된 마스터 라벨 리터럴(긴 라벨 우선: '등록대상기존화학물질' > '기존화학물질')
+#   → 후보 전체가 라벨이거나 '항목명(물질명·법령명):' 뒤 값이 라벨뿐일 때만 fuzzy 없이 확정(fullmatch)
+#   → 라벨을 단순히 포함하는 문장('…기존화학물질목록', 'EINECS에 상장…')은 fuzzy 점수에 맡김
+_LABEL_PREFIX_MAX = 40
+_LABEL_RX = re.compile(
+    rf"(?:[^:]{{1,{_LABEL_PREFIX_MAX}}}:)?("
+    + "|".join(map(re.escape, sorted(_MASTER_KEYS, key=len, reverse=True)))
+    + ")"
+)
 
 def _regex_first_pass(text: str) -> Optional[str]:
     if not text:
         return None
-    for pat, canon in REGEX_MAP:
-        if re.search(pat, text, flags=re.I):
+    for rx, canon in REGEX_MAP_C:
+        if rx.search(text):
             return canon
     return None
 
@@ -87,12 +109,15 @@ def _fuzzy_match(norm: str, min_score: int = 82) -> Tuple[Optional[str], int]:
     # 완전일치 먼저
     if norm in _MASTER_IDX:
         return (_MASTER_IDX[norm], 100)
-    # fuzzy
+    if min_score > 0 and _MASTER_CHARS.isdisjoint(norm):
+        return (None, 0)
+    # fuzzy — 채택 기준 미만은 어차피 버려지므로 score_cutoff로 조기 종료
     if _HAS_RAPID:
         best = process.extractOne(
             norm,
-            list(_MASTER_IDX.keys()),
-            scorer=fuzz.WRatio  # 종합 스코어
+            _MASTER_KEYS,
+            scorer=fuzz.WRatio,  # 종합 스코어
+            score_cutoff=min_score
         )
         if best:
             key, score, _ = best
@@ -100,7 +125,7 @@ def _fuzzy_match(norm: str, min_score: int = 82) -> Tuple[Optional[str], int]:
         return (None, 0)
     else:
         # difflib 백업
-        cands = difflib.get_close_matches(norm, list(_MASTER_IDX.keys()), n=1, cutoff=min_score/100.0)
+        cands = difflib.get_close_matches(norm, _MASTER_KEYS, n=1, cutoff=min_score/100.0)
         if cands:
             key = cands[0]
             # 대략적인 점수 환산(유사)
@@ -108,12 +133,8 @@ def _fuzzy_match(norm: str, min_score: int = 82) -> Tuple[Optional[str], int]:
             return (_MASTER_IDX[key], score)
         return (None, 0)
 
-def map_label(raw_text: str, min_score: int = 82) -> Tuple[Optional[str], int, str, str]:
-    """
-    raw_text: 원문 라벨
-    return: (매핑된 정식 라벨, 점수, 소스[regex|rule|fuzzy|none], norm)
-    """
-    norm_before = normalize_label(raw_text)
+def _map_label_rules(raw_text: str, norm_before: str) -> Optional[Tuple[Optional[str], int, str, str]]:
+    """map_label 1)~3) 단계(정규식/룰/라벨 리터럴). 정하지 못하면 None."""
     # 1) 정규식(원문) 우선
     hit = _regex_first_pass(raw_text)
     if hit:
@@ -127,9 +148,65 @@ def map_label(raw_text: str, min_score: int = 82) -> Tuple[Optional[str], int, s
     if fix:
         canon, score, src = fix
         return (canon, score, src, norm_before)
-    # 4) fuzzy
-    canon, score = _fuzzy_match(norm_before, min_score=min_score)
+    # 3-1) 마스터 라벨 리터럴 완전일치(짧은 항목명 접두 허용) — 정규식 단계와 동일하게 취급
+    m = _LABEL_RX.fullmatch(norm_before) if norm_before else None
+    if m:
+        return (_MASTER_IDX[m.group(1)], 100, 'regex', norm_before)
+    return None
+
+def _fuzzy_result(norm: str, canon: Optional[str], score: int, min_score: int) -> Tuple[Optional[str], int, str, str]:
+    # 4) fuzzy 채택 / 5) 실패
     if canon and score >= min_score:
-        return (canon, score, 'fuzzy', norm_before)
-    # 5) 실패
-    return (None, 0, 'none', norm_before)
+        return (canon, score, 'fuzzy', norm)
+    return (None, 0, 'none', norm)
+
+def map_label(raw_text: str, min_score: int = 82) -> Tuple[Optional[str], int, str, str]:
+    """
+    raw_text: 원문 라벨
+    return: (매핑된 정식 라벨, 점수, 소스[regex|rule|fuzzy|none], norm)
+    """
+    norm_before = normalize_label(raw_text)
+    res = _map_label_rules(raw_text, norm_before)
+    if res:
+        return res
+    canon, score = _fuzzy_match(norm_before, min_score=min_score)
+    return _fuzzy_result(norm_before, canon, score, min_score)
+
+def map_labels_batch(raw_texts: List[str], min_score: int = 82) -> List[Tuple[Optional[str], int, str, str]]:
+    """
+    map_label 일괄판(결과 동일). 정규식/룰로 못 정한 후보만 모아
+    rapidfuzz cdist 1회로 마스터 전체와 점수 행렬을 계산.
+    """
+    norms = [normalize_label(r) for r in raw_texts]
+    out = [_map_label_rules(r, n) for r, n in zip(raw_texts, norms)]
+    pending = [i for i, res in enumerate(out) if res is None]
+    if not _HAS_RAPID or not _MASTER_KEYS:
+        for i in pending:
+            canon, score = _fuzzy_match(norms[i], min_score=min_score)
+            out[i] = _fuzzy_result(norms[i], canon, score, min_score)
+        return out
+
+    fuzzy_idx = []
+    for i in pending:
+        n = norms[i]
+        if not n:
+            out[i] = _fuzzy_result(n, None, 0, min_score)
+        elif n in _MASTER_IDX:  # 완전일치
+            out[i] = _fuzzy_result(n, _MASTER_IDX[n], 100, min_score)
+        elif min_score > 0 and _MASTER_CHARS.isdisjoint(n):
+            out[i] = _fuzzy_result(n, None, 0, min_score)
+        else:
+            fuzzy_idx.append(i)
+    if fuzzy_idx:
+        scores = process.cdist([norms[i] for i in fuzzy_idx], _MASTER_KEYS, scorer=fuzz.WRatio,
+                               score_cutoff=min_score, dtype=np.float64)
+        best = scores.argmax(axis=1)  # 동점이면 앞선 마스터(extractOne과 동일)
+        # 행별 최고점·채택 여부를 배열 연산 1회로(int() 절사와 동일하게 정수 변환)
+        best_score = scores[np.arange(len(best)), best].astype(np.int64)
+        accepted = best_score >= min_score
+        for row, i in enumerate(fuzzy_idx):
+            if accepted[row]:
+                out[i] = (_MASTER_IDX[_MASTER_KEYS[best[row]]], int(best_score[row]), 'fuzzy', norms[i])
+            else:
+                out[i] = (None, 0, 'none', norms[i])
+    return out
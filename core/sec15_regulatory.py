@@ -1,15 +1,18 @@
 # core/sec15_regulatory.py
 from __future__ import annotations
 import re
+from functools import lru_cache
 from typing import Dict, List, Tuple
 import pandas as pd
-from .reg_master_map import map_label
+from .reg_master_map import map_labels_batch
 
 _HINT_TOKENS = [
     '규제','규정','법규','법적','관련법령','대상물질',
     'PRTR','유독','지정폐기','작업환경측정','노출기준설정',
     'Regulatory','Regulation'
 ]
+# 힌트 토큰 통합 패턴(줄마다 토큰 13개 부분문자열 검사 대신 1회 검색)
+_HINT_RX = re.compile("|".join(map(re.escape, _HINT_TOKENS)), re.I)
 
 _CANON_PATTERNS: List[Tuple[str, str]] = [
     (r'관리\s*대상\s*유해\s*물질', '관리대상유해물질'),
@@ -20,6 +23,22 @@ _CANON_PATTERNS: List[Tuple[str, str]] = [
     (r'지정\s*폐기\s*물', '지정폐기물'),
 ]
 
+# 정식 패턴 통합(그룹 g{i} = i번째 패턴) — 텍스트당 1회 스캔.
+# 모든 패턴이 '물질'/'물'로 끝나므로 '물'이 없는 조각은 스캔 자체를 생략
+_CANON_ANY_RX = re.compile("|".join(f"(?P<g{i}>{p})" for i, (p, _) in enumerate(_CANON_PATTERNS)), re.I)
+_CANON_REQUIRED = '물'
+
+_LEAD_LABEL_RX   = re.compile(r'^\s*(?:PRODUCT|항목|대상물질)\s*[:：]\s*', re.I)
+_ROUGH_SPLIT_RX  = re.compile(r'[;,/｜|·•ㆍ∙‧・]\s*')
+_NUMERIC_ONLY_RX = re.compile(r'[\d\.\%\s\(\)\[\]\-–~]+')
+_THRESHOLD_RX    = re.compile(r'[(（]\s*([^()（）]{1,40})\s*[)）]')
+
+@lru_cache(maxsize=256)
+def _lead_rx(token: str, colon: bool) -> re.Pattern:
+    """벤더 YAML의 불릿/헤더 접두 제거 패턴(토큰별 1회 컴파일)."""
+    tail = r'\s*[:：]?\s*' if colon else r'\s*'
+    return re.compile(rf'^\s*{re.escape(token)}{tail}')
+
 _DEFAULT_SPLITS = [",",";","·","•","ㆍ","∙","‧","・","/","｜","|"]
 
 def _split_by_vendor(sec15_text: str, vendor_cfg: Dict) -> List[str]:
@@ -33,30 +52,32 @@ def _split_by_vendor(sec15_text: str, vendor_cfg: Dict) -> List[str]:
         if not s: continue
         if len(s) < 2: continue
         lines.append(s)
-    headers = [h.strip() for h in (cfg.get('product_header') or []) if h]
-    bullets = [b for b in (cfg.get('bullet_product_header') or []) if b]
+    headers = [_lead_rx(h.strip(), True) for h in (cfg.get('product_header') or []) if h]
+    bullets = [_lead_rx(b, False) for b in (cfg.get('bullet_product_header') or []) if b]
+    # 구분자가 모두 한 글자면 첫 구분자로 치환(translate) 후 한 번만 split — 토큰별 반복 split 생략
+    delim = split_tokens[0] if split_tokens and all(len(t) == 1 for t in split_tokens) else None
+    tbl = str.maketrans({t: delim for t in split_tokens}) if delim else None
     items: List[str] = []
     for ln in lines:
         ln2 = ln
-        for b in bullets:
-            ln2 = re.sub(rf'^\s*{re.escape(b)}\s*', '', ln2)
-        for h in headers:
-            ln2 = re.sub(rf'^\s*{re.escape(h)}\s*[:：]?\s*', '', ln2)
-        parts = [ln2]
-        for tok in split_tokens:
-            tmp: List[str] = []
-            for p in parts:
-                tmp.extend([q.strip() for q in p.split(tok)])
-            parts = tmp
+        for rx in bullets:
+            ln2 = rx.sub('', ln2)
+        for rx in headers:
+            ln2 = rx.sub('', ln2)
+        if tbl is not None:
+            parts = [q.strip() for q in ln2.translate(tbl).split(delim)]
+        else:
+            parts = [ln2]
+            for tok in split_tokens:
+                tmp: List[str] = []
+                for p in parts:
+                    tmp.extend([q.strip() for q in p.split(tok)])
+                parts = tmp
         for p in parts:
             if p and len(p) >= 2:
                 items.append(p)
-    uniq: List[str] = []
-    seen = set()
-    for it in items:
-        if it in seen: continue
-        seen.add(it); uniq.append(it)
-    return uniq
+    # 첫 등장 순서를 유지한 중복 제거
+    return list(dict.fromkeys(items))
 
 def _fallback_regex(sec15_text: str) -> List[str]:
     if not sec15_text:
@@ -64,34 +85,35 @@ def _fallback_regex(sec15_text: str) -> List[str]:
     cands: List[str] = []
     rough = []
     for ln in sec15_text.splitlines():
-        ln = re.sub(r'^\s*(?:PRODUCT|항목|대상물질)\s*[:：]\s*', '', ln, flags=re.I)
-        parts = re.split(r'[;,/｜|·•ㆍ∙‧・]\s*', ln)
+        ln = _LEAD_LABEL_RX.sub('', ln)
+        parts = _ROUGH_SPLIT_RX.split(ln)
         rough.extend([p.strip() for p in parts if p.strip()])
     for text in rough + [sec15_text]:
-        for pat, canon in _CANON_PATTERNS:
-            for m in re.finditer(pat, text, flags=re.I):
-                start, end = m.span()
-                ctx = text[max(0, start-0): min(len(text), end+40)]
-                cands.append(ctx.strip())
-    out: List[str] = []
-    seen = set()
-    for t in cands:
-        if t not in seen:
-            seen.add(t); out.append(t)
-    return out
+        if _CANON_REQUIRED not in text:
+            continue
+        # 통합 패턴 1회 스캔 후 패턴 순서대로 배출(후보 순서는 패턴별 스캔과 동일)
+        by_pat: List[List[str]] = [[] for _ in _CANON_PATTERNS]
+        for m in _CANON_ANY_RX.finditer(text):
+            start, end = m.span()
+            by_pat[int(m.lastgroup[1:])].append(text[start: min(len(text), end+40)].strip())
+        for ctxs in by_pat:
+            cands.extend(ctxs)
+    return list(dict.fromkeys(cands))
 
 def _filter_candidates(cands: List[str]) -> List[str]:
     out = []
     for c in cands:
-        if re.fullmatch(r'[\d\.\%\s\(\)\[\]\-–~]+', c):
+        if _NUMERIC_ONLY_RX.fullmatch(c):
             continue
         out.append(c)
     return out
 
 def _threshold_from_text(s: str) -> str:
-    m = re.search(r'[(（]\s*([^()（）]{1,40})\s*[)）]', s)
+    m = _THRESHOLD_RX.search(s)
     return m.group(1).strip() if m else ""
 
+_REG_COLUMNS = ["chemical","raw","norm","threshold","match_category","match_score","match_source"]
+
 def extract_regulatory_items(
     full_text: str,
     sec15_text: str,
@@ -99,31 +121,31 @@ def extract_regulatory_items(
     master_labels: List[str],
     min_score: int = 82
 ) -> pd.DataFrame:
-    
+    # 15항 본문이 비었거나 공백뿐이면 후보가 나올 수 없음 — 분할/정규식/매핑 단계 전부 생략
+    if not sec15_text or sec15_text.isspace():
+        return pd.DataFrame(columns=_REG_COLUMNS)
+
     cands = _split_by_vendor(sec15_text, vendor_cfg)
     if not cands:
         cands = _fallback_regex(sec15_text)
-    if not cands and sec15_text:
+    if not cands and sec15_text and _HINT_RX.search(sec15_text):
+        # 힌트 줄 ±2줄 문맥 — 창이 겹치므로 중복 제거(다른 경로와 동일하게 순서 유지)
         lines = sec15_text.splitlines()
-        ctx = []
-        for i, ln in enumerate(lines):
-            lw = ln.lower()
-            if any(k.lower() in lw for k in _HINT_TOKENS):
-                ctx.extend(lines[max(0, i-2): i+3])
-        cands = [t.strip() for t in ctx if t.strip()]
+        ctx = (t.strip() for i, ln in enumerate(lines) if _HINT_RX.search(ln)
+               for t in lines[max(0, i-2): i+3])
+        cands = list(dict.fromkeys(t for t in ctx if t))
     if not cands:
-        return pd.DataFrame(columns=[
-            "chemical","raw","norm","threshold","match_category","match_score","match_source"
-        ])
+        return pd.DataFrame(columns=_REG_COLUMNS)
 
     cands = _filter_candidates(cands)
 
     rows: List[Dict] = []
     chemical_ctx = 'PRODUCT'
 
-    for raw in cands:
+    # 후보 전체를 한 번에 매핑(fuzzy 점수는 행렬 1회 계산)
+    for raw, (mapped, score, src, norm) in zip(cands, map_labels_batch(cands, min_score=min_score)):
         thr = _threshold_from_text(raw)
-        mapped, score, src, norm = map_label(raw, min_score=min_score)
+        score = score or 0
         rows.append({
             "chemical": chemical_ctx,
             "raw": raw,
@@ -132,28 +154,12 @@ def extract_regulatory_items(
             "match_category": mapped or "",
             "match_score": score,
             "match_source": src,
+            # 정렬 순위: regex/고점수(0) → fuzzy(1) → 미매핑(2)
+            "_rk": 0 if src == "regex" or score >= 90 else 1 if src == "fuzzy" else 2,
         })
 
-    df = pd.DataFrame(rows)
-    if df.empty:
-        return df
-
-    def _rk(r):
-        if r.get("match_source") == "regex" or r.get("match_score", 0) >= 90:
-            return 0
-        if r.get("match_source") == "fuzzy":
-            return 1
-        return 2
-
-    if "match_score" not in df.columns:
-        df["match_score"] = 0
-    df["_rk"] = df.apply(_rk, axis=1)
-
-    df = (
-        df.sort_values(["_rk", "chemical", "match_score"],
-                       ascending=[True, True, False],
-                       kind="stable")
-          .drop(columns=["_rk"])
-          .reset_index(drop=True)
-    )
-    return df
+    # 수십 행 규모라 DataFrame 정렬보다 리스트 정렬(안정 정렬)이 빠름 — DataFrame은 마지막에 한 번만 생성
+    rows.sort(key=lambda r: (r["_rk"], r["chemical"], -r["match_score"]))
+    for r in rows:
+        del r["_rk"]
+    return pd.DataFrame(rows, columns=_REG_COLUMNS)
@@ -5,26 +5,36 @@ from typing import List, Tuple
 H_RX = re.compile(r"\bH\s*[1-4]\d{2}[A-Z]?\b")
 P_RX = re.compile(r"\bP\d{3}[A-Z]?\b")
 P_COMBO_RX = re.compile(r"\bP\d{3}[A-Z]?(?:\s*[\+\＋]\s*P\d{3}[A-Z]?)+\b")
+# H/P(조합 포함)를 한 번에 훑는 통합 패턴 — 조합이 단일보다 먼저 시도됨
+HP_RX = re.compile(
+    r"\b(?:(?P<combo>P\d{3}[A-Z]?(?:\s*[\+\＋]\s*P\d{3}[A-Z]?)+)\b"
+    r"|(?P<h>H\s*[1-4]\d{2}[A-Z]?)\b"
+    r"|(?P<p>P\d{3}[A-Z]?)\b)"
+)
 
 # 신호어: 한국어/영어 모두 대응
 SIG_KO_RX = re.compile(r"신호어\s*[:：\-]?\s*(위험|경고|해당\s*없음|무\s*해당)", re.I)
 SIG_EN_RX = re.compile(r"signal\s*word\s*[:：\-]?\s*(danger|warning|none|not\s*applicable|not\s*classified)", re.I)
 
 def _norm(s: str) -> str:
-    return unicodedata.normalize("NFKC", s or "")
+    s = s or ""
+    # ASCII는 NFKC 결과가 자기 자신 — 정규화 호출 생략
+    return s if s.isascii() else unicodedata.normalize("NFKC", s)
 
 def list_h_p_codes(text: str) -> Tuple[List[str], List[str]]:
     t = _norm(text)
-    # H
-    h = sorted({c.replace(" ", "") for c in H_RX.findall(t)})
-    # P (조합 + 단일)
-    p = set()
-    for blk in P_COMBO_RX.findall(t):
-        p.add(blk.replace(" ", "").replace("＋", "+"))
-        for c in P_RX.findall(blk):
+    h, p = set(), set()
+    # 단일 패스: H / P 조합(구성 코드도 함께) / P 단일
+    for m in HP_RX.finditer(t):
+        kind = m.lastgroup
+        c = m.group(kind)
+        if kind == "h":
+            h.add(c.replace(" ", ""))
+        elif kind == "p":
             p.add(c)
-    for c in P_RX.findall(t):
-        p.add(c)
+        else:
+            p.add(c.replace(" ", "").replace("＋", "+"))
+            p.update(P_RX.findall(c))
     return sorted(h), sorted(p)
 
 def extract_signal_word(text: str) -> str:
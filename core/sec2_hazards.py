@@ -1,15 +1,22 @@
 # core/sec2_hazards.py
 import os            # ← 추가
 import re, unicodedata
-from typing import Dict, List, Tuple, Set
+from functools import lru_cache
+from typing import Dict, List, Tuple, Set, FrozenSet
 
 def _norm(s: str) -> str:
-    return unicodedata.normalize("NFKC", s or "")
+    s = s or ""
+    # ASCII는 NFKC 결과가 자기 자신 — 정규화 호출 생략
+    return s if s.isascii() else unicodedata.normalize("NFKC", s)
 
 # H/P 코드
-H_CODE_RX = re.compile(r"\bH\s*[1-4]\d{2}[A-Z]?\b")
-P_CODE_BLOCK_RX = re.compile(r"\bP\d{3}[A-Z]?(?:\s*[\+\＋]\s*P\d{3}[A-Z]?)+\b")
 P_CODE_RX       = re.compile(r"\bP\d{3}[A-Z]?\b")
+# H / P 조합 / P 단일을 한 번에 훑는 통합 패턴(그룹명으로 구분) — 조합이 단일보다 먼저 시도됨
+HP_CODE_RX = re.compile(
+    r"\b(?:(?P<blk>P\d{3}[A-Z]?(?:\s*[\+\＋]\s*P\d{3}[A-Z]?)+)\b"
+    r"|(?P<h>H\s*[1-4]\d{2}[A-Z]?)\b"
+    r"|(?P<p>P\d{3}[A-Z]?)\b)"
+)
 
 # 분류(구분)
 CLASS_LINE_RXES = [
@@ -17,59 +24,59 @@ CLASS_LINE_RXES = [
     re.compile(r"^\s*[-•]?\s*(?P<class>[^:\n]+?)\s*[:\-]\s*구분\s*(?P<cat>\d+[A-Z]?)\b", re.I),
 ]
 
+# 블록 종료 라벨(다음 라벨/표지요소/신호어/그림문자/소제목 등)
 STOP_LABEL_RX = re.compile(
-    r"^\s*(?:유해[·/\s]?위험문구|예방조치문구|그림문자|표지요소|label elements|신호어|응급조치|취급 및 저장|handling|first[-\s]?aid)\b",
+    r"^\s*(?:예방조치문구|유해[·/\s]?위험문구|그림문자|표지요소|label elements|신호어|저장|폐기|대응|응급조치|취급 및 저장|handling|first[-\s]?aid)\b",
     re.I
 )
 
 P_CODE_ANY_RX = re.compile(r"\bP\d{3}[A-Z]?\b")
+_BULLET_LEAD_RX = re.compile(r"^\s*[-•·▪▫▶]+\s*")
+_WS_RUN_RX = re.compile(r"\s+")
+P_SCORE_WINDOW = 80  # 예방조치 후보 라벨 이후 P코드를 세는 줄 수
 
-def _find_label_lines(lines: List[str], labels: List[str]) -> List[int]:
-    idxs = []
+def _find_label_lines(lows: List[str], labels: List[str]) -> List[int]:
+    """라벨이 포함된 줄 번호(lows = strip+lower 된 줄)."""
     low_labels = [l.lower() for l in labels]
-    for i, ln in enumerate(lines):
-        low = ln.strip().lower()
-        if any(lbl in low for lbl in low_labels):
-            idxs.append(i)
-    return idxs
+    return [i for i, low in enumerate(lows) if any(lbl in low for lbl in low_labels)]
 
-def _slice_precaution_block(text: str, start_labels: List[str]) -> str:
+def _collect_until_stop(lines: List[str], start: int) -> str:
+    """start 줄부터 STOP 라벨 전까지 불릿 제거 후 수집(머리/꼬리 빈 줄 제거)."""
+    out: List[str] = []
+    for ln in lines[start:]:
+        if STOP_LABEL_RX.search(ln):
+            break
+        # 점/불릿/콜론만 있는 라벨 잔재 제거
+        out.append(_BULLET_LEAD_RX.sub("", ln).rstrip())
+    # 머리/꼬리 빈 줄은 인덱스로 건너뛰고 한 번에 슬라이스(pop(0) 반복 없이)
+    head, tail = 0, len(out)
+    while head < tail and not out[head].strip(): head += 1
+    while tail > head and not out[tail-1].strip(): tail -= 1
+    return "\n".join(out[head:tail])
+
+def _slice_precaution_block(lines: List[str], lows: List[str], start_labels: List[str]) -> str:
     """'예방조치문구'가 두 번 등장(경고표지/본문)하는 문서를 대비.
-    - 후보 라벨 지점들 중, 이후 80줄 내 P코드가 2개 이상 보이는 지점을 '진짜' 시작으로 선택
+    - 후보 라벨 지점들 중, 이후 80줄 내 P코드가 가장 많은 지점을 '진짜' 시작으로 선택
     - 선택 후엔 STOP 라벨 나오기 전까지 수집
     """
-    if not text:
-        return ""
-    lines = _norm(text).splitlines()
-
-    cand_idxs = _find_label_lines(lines, start_labels)
+    cand_idxs = _find_label_lines(lows, start_labels)
     if not cand_idxs:
         return ""
-
-    def score_after(start_i: int) -> int:
-        chunk = "\n".join(lines[start_i+1 : start_i+1+80])
-        return len(P_CODE_ANY_RX.findall(chunk))
-
-    # 후보 중 점수(=P코드 수)가 가장 큰 지점 선택
-    best_i, best_s = None, -1
-    for i in cand_idxs:
-        s = score_after(i)
-        if s > best_s:
-            best_i, best_s = i, s
-    if best_i is None:
-        return ""
-
+    best_i = cand_idxs[0]
+    if len(cand_idxs) > 1:
+        # 줄별 P코드 수 누적합 — 후보마다 80줄을 다시 잇고 훑지 않음(코드는 줄을 넘지 않으므로 합이 동일)
+        acc = [0]
+        for ln in lines:
+            acc.append(acc[-1] + len(P_CODE_ANY_RX.findall(ln)))
+        n = len(lines)
+        best_s = -1
+        for i in cand_idxs:
+            sc = acc[min(n, i + 1 + P_SCORE_WINDOW)] - acc[i + 1]
+            if sc > best_s:
+                best_i, best_s = i, sc
     # 선택 지점 바로 다음 줄부터 STOP 전까지 수집
-    out = []
-    for ln in lines[best_i+1:]:
-        if STOP_LABEL_RX.search(ln):
-            break
-        s = re.sub(r"^\s*[-•·▪▫▶]+\s*", "", ln).rstrip()
-        out.append(s)
-    while out and not out[0].strip(): out.pop(0)
-    while out and not out[-1].strip(): out.pop()
-    return "\n".join(out)
-  
+    return _collect_until_stop(lines, best_i + 1)
+
 # 섹션2 키
 def _sec2_text_from_sections(sections: Dict) -> str:
     for k in ("2_hazards", "hazards", "2", "section2", "sec2"):
@@ -81,36 +88,14 @@ def _sec2_text_from_sections(sections: Dict) -> str:
 DEFAULT_H_LABELS = ["유해·위험문구", "유해/위험문구", "hazard statements", "유해 위험문구", "경고문"]
 DEFAULT_P_LABELS = ["예방조치문구", "precautionary statements", "예방", "주의문"]
 
-# 블록 종료 라벨(다음 라벨/표지요소/신호어/그림문자/소제목 등)
-STOP_LABEL_RX = re.compile(
-    r"^\s*(?:예방조치문구|유해[·/\s]?위험문구|그림문자|표지요소|label elements|신호어|저장|폐기|대응|응급조치|취급 및 저장|handling|first[-\s]?aid)\b",
-    re.I
-)
-
-def _slice_block(text: str, start_labels: List[str]) -> str:
-    if not text: return ""
-    lines = _norm(text).splitlines()
-    start_idx = -1
+def _slice_block(lines: List[str], lows: List[str], start_labels: List[str]) -> str:
     # 시작 지점 찾기(가장 먼저 등장하는 라벨 줄)
-    for i, ln in enumerate(lines):
-        low = ln.strip().lower()
-        if any(lbl.lower() in low for lbl in start_labels):
-            start_idx = i
-            break
-    if start_idx < 0:
-        return ""
-    # 시작 라벨 바로 다음 줄부터 수집
-    out: List[str] = []
-    for ln in lines[start_idx+1:]:
-        if STOP_LABEL_RX.search(ln):
-            break
-        # 점/불릿/콜론만 있는 라벨 잔재 제거
-        s = re.sub(r"^\s*[-•·▪▫▶]+\s*", "", ln).rstrip()
-        out.append(s)
-    # 머리/꼬리 공백여러줄 제거
-    while out and not out[0].strip(): out.pop(0)
-    while out and not out[-1].strip(): out.pop()
-    return "\n".join(out)
+    low_labels = [l.lower() for l in start_labels]
+    for i, low in enumerate(lows):
+        if any(lbl in low for lbl in low_labels):
+            # 시작 라벨 바로 다음 줄부터 수집
+            return _collect_until_stop(lines, i + 1)
+    return ""
 
 # H→GHS 코드
 H_TO_PICTO = {
@@ -123,42 +108,37 @@ H_TO_PICTO = {
     "H400":"GHS09","H410":"GHS09","H411":"GHS09","H412":"GHS09","H413":"GHS09",
 }
 
-def _extract_classifications(text: str) -> List[Dict]:
-    rows = []
-    if not text: return rows
-    for ln in _norm(text).splitlines():
+def _extract_classifications(lines: List[str]) -> List[Dict]:
+    rows: Dict[Tuple[str, str], Dict] = {}  # (분류, 구분) → 첫 행(중복 제거, 순서 유지)
+    for ln in lines:
         s = ln.strip()
-        if not s: continue
+        # 두 패턴 모두 '구분' 또는 'Category'가 있어야 매치 — 없는 줄은 정규식 생략
+        if not s or ("구분" not in s and "category" not in s.lower()): continue
         for rx in CLASS_LINE_RXES:
             m = rx.search(s)
             if m:
-                cls = re.sub(r"\s+", " ", m.group("class")).strip(" -:·")
+                cls = _WS_RUN_RX.sub(" ", m.group("class")).strip(" -:·")
                 cat = m.group("cat").strip()
-                rows.append({"hazard_class": cls, "category": cat, "raw": s})
+                rows.setdefault((cls, cat), {"hazard_class": cls, "category": cat, "raw": s})
                 break
-    # dedup
-    seen, out = set(), []
-    for r in rows:
-        k = (r["hazard_class"], r["category"])
-        if k not in seen:
-            out.append(r); seen.add(k)
-    return out
-
-def _extract_h_codes(text: str) -> List[str]:
-    t = _norm(text)
-    codes = {c.replace(" ", "") for c in H_CODE_RX.findall(t)}
-    return sorted(codes)
-
-def _extract_p_codes(text: str) -> List[str]:
-    t = _norm(text)
-    out: Set[str] = set()
-    for blk in P_CODE_BLOCK_RX.findall(t):
-        out.add(re.sub(r"\s+", "", blk).replace("＋", "+"))
-        for c in P_CODE_RX.findall(blk):
-            out.add(c)
-    for c in P_CODE_RX.findall(t):
-        out.add(c)
-    return sorted(out)
+    return list(rows.values())
+
+def _extract_hp_codes(t: str) -> Tuple[List[str], List[str]]:
+    """H코드, P코드(조합 포함) — 섹션 텍스트 1회 스캔."""
+    h: Set[str] = set()
+    p: Set[str] = set()
+    for m in HP_CODE_RX.finditer(t):
+        kind = m.lastgroup
+        c = m.group(kind)
+        if kind == "h":
+            h.add(c.replace(" ", ""))
+        elif kind == "p":
+            p.add(c)
+        else:
+            # 조합 자체 + 구성 코드(구성 코드는 매치 문자열 안에서만 탐색)
+            p.add(_WS_RUN_RX.sub("", c).replace("＋", "+"))
+            p.update(P_CODE_RX.findall(c))
+    return sorted(h), sorted(p)
 
 def _h_to_pictos(hcodes: List[str]) -> List[str]:
     pics: Set[str] = set()
@@ -168,13 +148,25 @@ def _h_to_pictos(hcodes: List[str]) -> List[str]:
         if g: pics.add(g)
     return sorted(pics)
 
+@lru_cache(maxsize=8)
+def _image_index(image_dir: str, mtime_ns: int) -> FrozenSet[str]:
+    """이미지 폴더 파일명 집합. 폴더 mtime이 바뀔 때만 다시 스캔."""
+    try:
+        return frozenset(os.listdir(image_dir))
+    except OSError:
+        return frozenset()
+
 def pictogram_images(pictos, image_dir: str) -> list:
     out = []
     if not pictos:
         return out
+    try:
+        names = _image_index(image_dir, os.stat(image_dir).st_mtime_ns)
+    except OSError:
+        names = frozenset()
     for p in list(pictos):
-        path = os.path.join(image_dir, f"{p}.gif")
-        out.append({"pictogram": p, "path": path, "exists": os.path.exists(path)})
+        fname = f"{p}.gif"
+        out.append({"pictogram": p, "path": os.path.join(image_dir, fname), "exists": fname in names})
     return out
 
 def extract_sec2_hazards(full_text: str, sections: Dict, vendor_yaml: Dict = None) -> Dict:
@@ -182,12 +174,15 @@ def extract_sec2_hazards(full_text: str, sections: Dict, vendor_yaml: Dict = Non
     labels_p = (vendor_yaml or {}).get("sec2", {}).get("precaution_labels", DEFAULT_P_LABELS)
 
     sec2 = _sec2_text_from_sections(sections)
-    haz_block = _slice_block(sec2, labels_h)                 # 기존 그대로
-    pre_block = _slice_precaution_block(sec2, labels_p)      # ← 여기만 교체!
-
-    cls_rows = _extract_classifications(sec2)
-    h_codes  = _extract_h_codes(sec2)
-    p_codes  = _extract_p_codes(sec2)
+    # NFKC·줄 분할·소문자화는 섹션당 1회 — 블록 슬라이스/분류/코드 추출이 공유
+    t = _norm(sec2)
+    lines = t.splitlines()
+    lows = [ln.strip().lower() for ln in lines]
+    haz_block = _slice_block(lines, lows, labels_h)
+    pre_block = _slice_precaution_block(lines, lows, labels_p)
+
+    cls_rows = _extract_classifications(lines)
+    h_codes, p_codes = _extract_hp_codes(t)
     pictos   = _h_to_pictos(h_codes)
 
     logs = [
@@ -1,21 +1,85 @@
+import os
 import re
+import importlib
+from functools import lru_cache
 import pandas as pd
 
 CAS_RE = re.compile(r"\b(\d{2,7}-\d{2}-\d)\b")
+_EXPOSURE_RX  = re.compile(r"(?i)\b(국내기준|ACGIH|TWA|STEL|개인보호구)\b")
+_CONC_HINT_RX = re.compile(r"\d+\s*%|\d+\s*[~–\-]\s*\d+")
+_CAP_GROUP_RX = re.compile(r"\((?!\?)")
+_DIGIT_RX     = re.compile(r"\d")
+_NAME_CHAR_RX = re.compile(r"[A-Za-z가-힣]")
+
+_LEAD_FLAGS_RX = re.compile(r"^\(\?([aiLmsux]+)\)")
+_BACKREF_RX    = re.compile(r"\\[1-9]|\(\?P=")
+
+# 성분 행 열 순서 — 행은 이 순서의 튜플로 모아 DataFrame 생성 시 스키마를 고정
+_ROW_COLUMNS = ["name", "cas", "conc_raw", "low", "high", "value", "cmp", "unit", "rep"]
+
+def _conc_row(name: str, cas: str, conc: dict) -> tuple:
+    g = conc.get
+    return (name, cas, g("conc_raw", ""), g("low", ""), g("high", ""),
+            g("value", ""), g("cmp", ""), g("unit", ""), g("rep", ""))
+
+@lru_cache(maxsize=None)
+def _rx(p: str, flags: int = 0) -> re.Pattern:
+    """벤더 YAML 패턴 컴파일 캐시(패턴·플래그별 1회) — 호출·열·행마다 재컴파일/캐시 조회 방지."""
+    return re.compile(p, flags)
+
+@lru_cache(maxsize=None)
+def _optional_module(name: str):
+    """선택 의존성(camelot/tabula/pdfplumber) 1회만 import 시도. 없으면 None.
+    실패한 import는 파이썬이 캐시하지 않으므로, 문서마다 sys.path를 다시 뒤지지 않도록 결과를 보관."""
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
+
+# 표 읽기에 실패한 (백엔드, PDF 경로, mtime, 크기, 페이지) — 같은 조합은 이번 실행에서 다시 시도하지 않음
+_BACKEND_FAILED: set = set()
+
+def _pdf_key(pdf_path: str, pages_s: str):
+    try:
+        st = os.stat(pdf_path)
+    except OSError:
+        return None
+    return (pdf_path, st.st_mtime_ns, st.st_size, pages_s)
+
+@lru_cache(maxsize=None)
+def _union_rx(patterns: tuple, flags: int = 0):
+    """여러 패턴을 alternation 1개로 — '하나라도 매치되는가' 판정용. 합칠 수 없으면 None.
+    - 선두 전역 플래그 '(?i)…'는 범위 플래그 '(?i:…)'로 바꿔 그대로 유지
+    - 역참조가 있으면 그룹 번호가 어긋나므로 합치지 않음
+    """
+    parts = []
+    for a in patterns:
+        if not isinstance(a, str) or _BACKREF_RX.search(a):
+            return None
+        m = _LEAD_FLAGS_RX.match(a)
+        parts.append(f"(?{m.group(1)}:{a[m.end():]})" if m else f"(?:{a})")
+    try:
+        return re.compile("|".join(parts), flags)
+    except re.error:
+        return None
+
+def _alias_rx(aliases: tuple):
+    """헤더 별칭들을 alternation 1개로(열마다 별칭 수만큼 검색하지 않도록). 합칠 수 없으면 None."""
+    return _union_rx(aliases, re.I)
 
 def trim_section3_with_vendor(sec3: str, vendor_cfg: dict, logs: list):
     if not sec3: return sec3
     blk = (vendor_cfg.get("blockers") or {})
     for p in (blk.get("inner_stop") or []):
         try:
-            m = re.search(p, sec3, re.I | re.M)
+            m = _rx(p, re.I | re.M).search(sec3)
         except re.error:
             m = None
         if m:
             logs.append(f"[slice] inner_stop matched at {m.start()} → trimmed")
             sec3 = sec3[:m.start()].rstrip()
             break
-    if re.search(r"(?i)\b(국내기준|ACGIH|TWA|STEL|개인보호구)\b", sec3) and not re.search(r"\d+\s*%|\d+\s*[~–\-]\s*\d+", sec3):
+    if _EXPOSURE_RX.search(sec3) and not _CONC_HINT_RX.search(sec3):
         logs.append("[slice] Looks like exposure table → empty")
         return ""
     return sec3
@@ -28,20 +92,21 @@ def extract_sec3_tables_yaml(pdf_path: str, pages: list[int], vendor_cfg: dict)
     stop_rows_rx = tbl_cfg.get("stop_rows_regex")
     default_unit = conc_cfg.get("default_unit", "%")
 
-    RX_RANGE = re.compile(conc_cfg.get("range_regex", r"(\d+(?:\.\d+)?)\s*[~\-–]\s*(\d+(?:\.\d+)?)"), re.I)
-    RX_CMP   = re.compile(conc_cfg.get("cmp_regex",   r"(<=|>=|<|>|≤|≥)\s*(\d+(?:\.\d+)?)"), re.I)
-    RX_SINGLE= re.compile(conc_cfg.get("single_regex",r"(\d+(?:\.\d+)?)"), re.I)
-    RX_STOP  = re.compile(stop_rows_rx) if stop_rows_rx else None
+    RX_RANGE = _rx(conc_cfg.get("range_regex", r"(\d+(?:\.\d+)?)\s*[~\-–]\s*(\d+(?:\.\d+)?)"), re.I)
+    RX_CMP   = _rx(conc_cfg.get("cmp_regex",   r"(<=|>=|<|>|≤|≥)\s*(\d+(?:\.\d+)?)"), re.I)
+    RX_SINGLE= _rx(conc_cfg.get("single_regex",r"(\d+(?:\.\d+)?)"), re.I)
+    RX_STOP  = _rx(stop_rows_rx) if stop_rows_rx else None
 
     def _to_nc(p: str) -> str:
-        return re.sub(r"\((?!\?)", r"(?:", p)
+        return _CAP_GROUP_RX.sub(r"(?:", p)
 
-    RX_VOTE_CAS  = re.compile(vote.get("cas_cell_regex", r"\b\d{2,7}-\d{2}-\d\b"))
-    RX_VOTE_CONC = [re.compile(_to_nc(x), re.I) for x in vote.get("conc_cell_regexes", [])]
+    RX_VOTE_CAS  = _rx(vote.get("cas_cell_regex", r"\b\d{2,7}-\d{2}-\d\b"))
+    RX_VOTE_CONC = [_rx(_to_nc(x), re.I) for x in vote.get("conc_cell_regexes", [])]
 
     def _parse_conc(cell: str) -> dict:
         s = (cell or "").strip()
-        if not s: return {}
+        # 세 패턴 모두 숫자를 잡아야 값이 되므로 숫자 없는 셀은 검색 생략
+        if not s or not _DIGIT_RX.search(s): return {}
         m = RX_RANGE.search(s)
         if m:
             lo, hi = float(m.group(1)), float(m.group(2))
@@ -62,22 +127,24 @@ def extract_sec3_tables_yaml(pdf_path: str, pages: list[int], vendor_cfg: dict)
 
     def _pick_col_by_header(df: pd.DataFrame, key: str):
         aliases = header_aliases.get(key, [])
+        rx = _alias_rx(tuple(aliases)) if aliases else None
+        if rx is not None:
+            return next((c for c in df.columns if rx.search(str(c))), None)
         for c in df.columns:
             s = str(c)
-            if any(re.search(a, s, re.I) for a in aliases):
+            if any(_rx(a, re.I).search(s) for a in aliases):
                 return c
         return None
 
     def _pick_col_by_vote(df: pd.DataFrame, kind: str):
+        # 셀 투표는 행별 apply 콜백 대신 값 리스트를 직접 순회
         if kind == "cas":
-            scores = {c: df[c].astype(str).apply(lambda x: 1 if RX_VOTE_CAS.search(x) else 0).sum() for c in df.columns}
+            scores = {c: sum(1 for x in df[c].astype(str).tolist() if RX_VOTE_CAS.search(x)) for c in df.columns}
             return max(scores, key=scores.get) if scores else None
         if kind == "conc":
             def _score_col(c):
-                vals = df[c].astype(str)
-                sc = 0
-                for rx in RX_VOTE_CONC: sc += vals.apply(lambda x: 1 if rx.search(x) else 0).sum()
-                return int(sc)
+                vals = df[c].astype(str).tolist()
+                return sum(1 for rx in RX_VOTE_CONC for x in vals if rx.search(x))
             scores = {c: _score_col(c) for c in df.columns}
             return max(scores, key=scores.get) if scores else None
         return None
@@ -85,34 +152,40 @@ def extract_sec3_tables_yaml(pdf_path: str, pages: list[int], vendor_cfg: dict)
     def _df_to_rows(df: pd.DataFrame):
         out=[]
         if df is None or df.empty: return out
-        df2 = df.copy().replace({None:"", pd.NA:""}).astype(str)
+        # replace/astype가 이미 새 프레임을 만들므로 사전 copy()는 불필요
+        df2 = df.replace({None:"", pd.NA:""}).astype(str)
         if df2.columns.astype(str).str.contains("Unnamed").all():
-            df2.columns = [c.strip() for c in df2.iloc[0].tolist()]
-            df2 = df2.iloc[1:].reset_index(drop=True)
+            # 첫 행을 헤더로 승격 — 이후 루프는 인덱스를 쓰지 않으므로 reset_index 생략
+            header = df2.values[0].tolist()
+            df2 = df2.iloc[1:]
+            df2.columns = [c.strip() for c in header]
         c_name = _pick_col_by_header(df2,"name")
         c_cas  = _pick_col_by_header(df2,"cas")  or _pick_col_by_vote(df2,"cas")
         c_conc = _pick_col_by_header(df2,"conc") or _pick_col_by_vote(df2,"conc")
-        for _, r in df2.iterrows():
-            row_str = " | ".join([str(x) for x in r.tolist()])
+        # 행마다 Series를 만드는 iterrows 대신 값 리스트 + 열 이름 dict(열 이름이 겹치면 기존 방식 유지)
+        if df2.columns.is_unique:
+            cols = list(df2.columns)
+            rows_iter = ((vals, dict(zip(cols, vals))) for vals in df2.values.tolist())
+        else:
+            rows_iter = ((r.tolist(), r) for _, r in df2.iterrows())
+        for vals, r in rows_iter:
+            # 행 전체 문자열은 STOP 검사나 CAS 열 폴백이 필요할 때만 만든다
+            row_str = " | ".join([str(x) for x in vals]) if RX_STOP else None
             if RX_STOP and RX_STOP.search(row_str): break
             cas = ""
             if c_cas:
                 m = CAS_RE.search(str(r.get(c_cas, ""))); cas = m.group(1) if m else ""
             if not cas:
+                if row_str is None:
+                    row_str = " | ".join([str(x) for x in vals])
                 m = CAS_RE.search(row_str); cas = m.group(1) if m else ""
             if not cas: continue
             name = (str(r.get(c_name, "")).strip() if c_name else "")
             conc_cell = (str(r.get(c_conc, "")).strip() if c_conc else "")
             conc = _parse_conc(conc_cell)
-            if conc_cell and not conc and re.search(r"\d", conc_cell):
+            if conc_cell and not conc and _DIGIT_RX.search(conc_cell):
                 conc = _parse_conc(conc_cell + default_unit)
-            out.append({
-                "name": name, "cas": cas,
-                "conc_raw": conc.get("conc_raw",""),
-                "low": conc.get("low",""), "high": conc.get("high",""),
-                "value": conc.get("value",""), "cmp": conc.get("cmp",""),
-                "unit": conc.get("unit",""), "rep": conc.get("rep",""),
-            })
+            out.append(_conc_row(name, cas, conc))
         return out
 
     rows=[]
@@ -126,56 +199,104 @@ def extract_sec3_tables_yaml(pdf_path: str, pages: list[int], vendor_cfg: dict)
         parts.append(f"{s}-{p0}" if s!=p0 else f"{s}")
         return ",".join(parts)
 
+    camelot = _optional_module("camelot")
+    tabula = _optional_module("tabula")
+    pdfplumber = _optional_module("pdfplumber")
+
+    pages_s = _pages_str(pages or [])
+    pdf_key = _pdf_key(pdf_path, pages_s)
+
+    def _failed(backend: str) -> bool:
+        return pdf_key is not None and (backend, pdf_key) in _BACKEND_FAILED
+
+    def _mark_failed(backend: str):
+        if pdf_key is not None: _BACKEND_FAILED.add((backend, pdf_key))
+
+    # 백엔드 읽기 실패만 캐시(행 변환 실패는 벤더 설정 탓일 수 있으므로 기록하지 않음)
     # camelot
-    try:
-        import camelot
-        tbs = camelot.read_pdf(pdf_path, pages=_pages_str(pages or []), flavor="lattice", line_scale=40)
-        for tb in tbs: rows += _df_to_rows(tb.df)
-        if rows: return pd.DataFrame(rows)
-    except Exception:
-        pass
+    if camelot is not None and not _failed("camelot"):
+        try:
+            tables = [tb.df for tb in camelot.read_pdf(pdf_path, pages=pages_s, flavor="lattice", line_scale=40)]
+        except Exception:
+            _mark_failed("camelot"); tables = []
+        try:
+            for t in tables: rows += _df_to_rows(t)
+            if rows: return pd.DataFrame(rows, columns=_ROW_COLUMNS)
+        except Exception:
+            pass
 
     # tabula
-    try:
-        import tabula
-        dfs = tabula.read_pdf(pdf_path, pages=_pages_str(pages or []), multiple_tables=True)
-        for df in dfs or []: rows += _df_to_rows(pd.DataFrame(df))
-        if rows: return pd.DataFrame(rows)
-    except Exception:
-        pass
+    if tabula is not None and not _failed("tabula"):
+        try:
+            tables = list(tabula.read_pdf(pdf_path, pages=pages_s, multiple_tables=True) or [])
+        except Exception:
+            _mark_failed("tabula"); tables = []
+        try:
+            for t in tables: rows += _df_to_rows(pd.DataFrame(t))
+            if rows: return pd.DataFrame(rows, columns=_ROW_COLUMNS)
+        except Exception:
+            pass
 
     # pdfplumber
-    try:
-        import pdfplumber
-        with pdfplumber.open(pdf_path) as pdf:
-            targets = pages or list(range(1, len(pdf.pages)+1))
-            for p in targets:
-                if 1<=p<=len(pdf.pages):
-                    for t in (pdf.pages[p-1].extract_tables() or []):
-                        rows += _df_to_rows(pd.DataFrame(t))
-        if rows: return pd.DataFrame(rows)
-    except Exception:
-        pass
+    if pdfplumber is not None and not _failed("pdfplumber"):
+        tables = []
+        try:
+            with pdfplumber.open(pdf_path) as pdf:
+                targets = pages or list(range(1, len(pdf.pages)+1))
+                for p in targets:
+                    if 1<=p<=len(pdf.pages):
+                        tables += pdf.pages[p-1].extract_tables() or []
+        except Exception:
+            # 일부 페이지라도 읽혔으면 그 결과를 쓰므로 실패로 기록하지 않음
+            if not tables: _mark_failed("pdfplumber")
+        try:
+            for t in tables: rows += _df_to_rows(pd.DataFrame(t))
+            if rows: return pd.DataFrame(rows, columns=_ROW_COLUMNS)
+        except Exception:
+            pass
 
-    return pd.DataFrame(rows)
+    return pd.DataFrame(rows, columns=_ROW_COLUMNS)
 
 # 엄격 block4 폴백 (이름→관용명→CAS→농도)
 def extract_block4_from_text(sec3_text: str, vendor_cfg: dict) -> pd.DataFrame:
     tbl_cfg = (vendor_cfg or {}).get("tables", {}) or {}
     conc_cfg = tbl_cfg.get("concentration", {}) or {}
-    RX_RANGE  = re.compile(conc_cfg.get("range_regex",  r"(?<!\d)(\d+(?:\.\d+)?)\s*[~\-–]\s*(\d+(?:\.\d+)?)(?:\s*%?)"))
-    RX_CMP    = re.compile(conc_cfg.get("cmp_regex",    r"(<=|>=|<|>|≤|≥)\s*(\d+(?:\.\d+)?)(?:\s*%?)"))
-    RX_SINGLE = re.compile(conc_cfg.get("single_regex", r"(?<!\d)(\d+(?:\.\d+)?)(?:\s*%?)(?!\d)"))
+    RX_RANGE  = _rx(conc_cfg.get("range_regex",  r"(?<!\d)(\d+(?:\.\d+)?)\s*[~\-–]\s*(\d+(?:\.\d+)?)(?:\s*%?)"))
+    RX_CMP    = _rx(conc_cfg.get("cmp_regex",    r"(<=|>=|<|>|≤|≥)\s*(\d+(?:\.\d+)?)(?:\s*%?)"))
+    RX_SINGLE = _rx(conc_cfg.get("single_regex", r"(?<!\d)(\d+(?:\.\d+)?)(?:\s*%?)(?!\d)"))
     default_unit = conc_cfg.get("default_unit", "%")
+    # 농도 줄 판정은 범위/비교/단일 중 하나라도 맞는지만 보므로 합친 패턴 1회 검색(합칠 수 없으면 3회)
+    RX_ANY_CONC = _union_rx((RX_RANGE.pattern, RX_CMP.pattern, RX_SINGLE.pattern))
 
-    drop_headers = [re.compile(p) for p in (tbl_cfg.get("block4_drop_headers") or [])]
-    stop_rx = re.compile(tbl_cfg.get("stop_rows_regex")) if tbl_cfg.get("stop_rows_regex") else None
+    drop_headers = [_rx(p) for p in (tbl_cfg.get("block4_drop_headers") or [])]
+    stop_rx = _rx(tbl_cfg.get("stop_rows_regex")) if tbl_cfg.get("stop_rows_regex") else None
 
     raw_lines = [ln.strip() for ln in (sec3_text or "").splitlines()]
     lines = [ln for ln in raw_lines if ln and not any(rx.search(ln) for rx in drop_headers)]
 
+    # 4줄 창이 한 줄씩 밀리므로 같은 줄을 여러 번 판정 — 줄별 결과 메모
+    conc_memo: dict = {}
+    name_memo: dict = {}
+    cas_memo: dict = {}
+
+    def find_cas(ln: str):
+        # 이름 판정(l0/l1)과 CAS 칸(l2)에서 같은 줄을 다시 검색하지 않도록
+        if ln in cas_memo:
+            return cas_memo[ln]
+        m = cas_memo[ln] = CAS_RE.search(ln)
+        return m
+
     def is_conc(ln: str) -> bool:
-        return bool(RX_RANGE.search(ln) or RX_CMP.search(ln) or RX_SINGLE.search(ln))
+        hit = conc_memo.get(ln)
+        if hit is None:
+            if not _DIGIT_RX.search(ln):
+                hit = False
+            elif RX_ANY_CONC is not None:
+                hit = RX_ANY_CONC.search(ln) is not None
+            else:
+                hit = bool(RX_RANGE.search(ln) or RX_CMP.search(ln) or RX_SINGLE.search(ln))
+            conc_memo[ln] = hit
+        return hit
 
     def parse_conc(ln: str) -> dict:
         m = RX_RANGE.search(ln)
@@ -197,26 +318,23 @@ def extract_block4_from_text(sec3_text: str, vendor_cfg: dict) -> pd.DataFrame:
         return {}
 
     def looks_like_name(ln: str) -> bool:
-        if CAS_RE.search(ln) or is_conc(ln): return False
-        return bool(re.search(r"[A-Za-z가-힣]", ln))
+        hit = name_memo.get(ln)
+        if hit is None:
+            hit = name_memo[ln] = not (find_cas(ln) or is_conc(ln)) and bool(_NAME_CHAR_RX.search(ln))
+        return hit
 
     rows=[]; i=0; n=len(lines)
     while i+3 < n:
         if stop_rx and stop_rx.search(lines[i]): break
         l0,l1,l2,l3 = lines[i], lines[i+1], lines[i+2], lines[i+3]
-        m_cas = CAS_RE.fullmatch(l2) or CAS_RE.search(l2)
+        # CAS_RE는 시작 위치가 같으면 매치가 하나뿐이라 fullmatch 선행 없이 search와 같은 그룹
+        m_cas = find_cas(l2)
         if looks_like_name(l0) and looks_like_name(l1) and m_cas and is_conc(l3):
             cas = m_cas.group(1)
             conc = parse_conc(l3)
             if conc:
-                rows.append({
-                    "name": l0, "cas": cas,
-                    "conc_raw": conc.get("conc_raw",""),
-                    "low": conc.get("low",""), "high": conc.get("high",""),
-                    "value": conc.get("value",""), "cmp": conc.get("cmp",""),
-                    "unit": conc.get("unit",""), "rep": conc.get("rep",""),
-                })
+                rows.append(_conc_row(l0, cas, conc))
                 i += 4; continue
         i += 1
 
-    return pd.DataFrame(rows)
+    return pd.DataFrame(rows, columns=_ROW_COLUMNS)
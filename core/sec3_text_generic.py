@@ -1,8 +1,14 @@
 # -*- coding: utf-8 -*-
 import re
 import pandas as pd
+from functools import lru_cache
 from typing import Dict, Any, List
 
+@lru_cache(maxsize=None)
+def _rx(p: str, flags: int = 0) -> re.Pattern:
+    """설정(YAML/기본값) 패턴 컴파일 캐시 — 줄·행마다 re.search(문자열)로 재조회하지 않도록."""
+    return re.compile(p, flags)
+
 def _midpoint(a: float, b: float) -> float:
     try:
         return round((float(a) + float(b)) / 2.0, 4)
@@ -15,41 +21,48 @@ def _to_num(s: str):
     except Exception:
         return None
 
-def _calc_repr(conc: str, conf: Dict[str, Any]) -> float | None:
-    conc = (conc or "").strip()
+def _repr_key(conf: Dict[str, Any]) -> tuple:
+    """대표값 계산에 쓰이는 설정(패턴 3종 + 중간값 모드)만 뽑은 해시 가능한 키."""
     cset = conf.get("concentration", {}) if conf else {}
-    r_rgx = cset.get("range_regex", r"(?<!\d)(\d+(?:\.\d+)?)\s*[~\-–]\s*(\d+(?:\.\d+)?)(?:\s*%?)")
-    c_rgx = cset.get("cmp_regex", r"(<=|>=|<|>|≤|≥)\s*(\d+(?:\.\d+)?)(?:\s*%?)")
-    s_rgx = cset.get("single_regex", r"(?<!\d)(\d+(?:\.\d+)?)(?:\s*%?)(?!\d)")
-    mode  = (cset.get("representative", {}) or {}).get("mode", "midpoint_if_range_else_value")
+    mode = (cset.get("representative", {}) or {}).get("mode", "midpoint_if_range_else_value")
+    return (cset.get("range_regex", r"(?<!\d)(\d+(?:\.\d+)?)\s*[~\-–]\s*(\d+(?:\.\d+)?)(?:\s*%?)"),
+            cset.get("cmp_regex", r"(<=|>=|<|>|≤|≥)\s*(\d+(?:\.\d+)?)(?:\s*%?)"),
+            cset.get("single_regex", r"(?<!\d)(\d+(?:\.\d+)?)(?:\s*%?)(?!\d)"),
+            mode.startswith("midpoint"))
 
-    m = re.search(r_rgx, conc)
-    if m and mode.startswith("midpoint"):
+# 농도 문자열은 행·문서 간 반복이 잦음(">99%", "1~5%") — (문자열, 설정키)로 결과 캐시
+@lru_cache(maxsize=4096)
+def _repr_cached(conc: str, key: tuple) -> float | None:
+    r_rgx, c_rgx, s_rgx, midpoint = key
+    conc = (conc or "").strip()
+    m = _rx(r_rgx).search(conc)
+    if m and midpoint:
         return _midpoint(m.group(1), m.group(2))
-    m = re.search(c_rgx, conc)
+    m = _rx(c_rgx).search(conc)
     if m:
         return _to_num(m.group(2))
-    m = re.search(s_rgx, conc)
+    m = _rx(s_rgx).search(conc)
     if m:
         return _to_num(m.group(1))
     return None
 
+def _calc_repr(conc: str, conf: Dict[str, Any]) -> float | None:
+    return _repr_cached(conc, _repr_key(conf))
+
 def _post_filter(df: pd.DataFrame, conf: Dict[str, Any]) -> pd.DataFrame:
     if df is None or df.empty:
         return pd.DataFrame(columns=["name","alias","cas","conc_raw","conc_repr"])
     # 진짜 CAS만
     cas_re = (conf.get("guards") or {}).get("cas_regex", r"\b\d{2,7}-\d{2}-\d\b")
     forbid = set((conf.get("guards") or {}).get("forbid_cas_fragments", []))
-    ok = []
-    for _, r in df.iterrows():
-        cas = str(r.get("cas","")).strip()
-        if cas and re.search(cas_re, cas) and cas not in forbid:
-            ok.append(True)
-        else:
-            ok.append(False)
+    cas_rx = _rx(cas_re)
+    # 행마다 Series를 만드는 iterrows 대신 CAS 열 값만 한 번에 검사
+    cas_vals = [str(x).strip() for x in df["cas"].tolist()] if "cas" in df.columns else [""] * len(df)
+    ok = [bool(cas) and bool(cas_rx.search(cas)) and cas not in forbid for cas in cas_vals]
     df = df.loc[ok].copy()
     if "conc_raw" in df.columns:
-        df["conc_repr"] = df["conc_raw"].map(lambda s: _calc_repr(s, conf))
+        key = _repr_key(conf)
+        df["conc_repr"] = df["conc_raw"].map(lambda s: _repr_cached(s, key))
     else:
         df["conc_raw"] = ""
         df["conc_repr"] = None
@@ -66,7 +79,7 @@ def _parse_block_ltr(text: str, conf: Dict[str, Any]) -> pd.DataFrame:
         s = line.strip()
         for p in pats:
             try:
-                m = re.search(p, s)
+                m = _rx(p).search(s)
             except re.error:
                 m = None
             if m:
@@ -78,6 +91,22 @@ def _parse_block_ltr(text: str, conf: Dict[str, Any]) -> pd.DataFrame:
                 break
     return _post_filter(pd.DataFrame(rows), conf)
 
+def _next_hit_index(lines: List[str], pat: str | None) -> List[int]:
+    """nxt[j] = j 이후(포함) pat이 처음 매치되는 줄 번호(없으면 len(lines)). 줄마다 검색 1회."""
+    n = len(lines)
+    nxt = [n] * (n + 1)
+    rx = None
+    if pat:
+        try:
+            rx = _rx(pat)
+        except re.error:
+            rx = None
+    if rx is None:
+        return nxt
+    for j in range(n - 1, -1, -1):
+        nxt[j] = j if rx.search(lines[j]) else nxt[j + 1]
+    return nxt
+
 def _parse_block_ttb(text: str, conf: Dict[str, Any]) -> pd.DataFrame:
     cfg = (conf or {}).get("block_ttb", {}) or {}
     vf = (cfg.get("vertical_fields") or {})
@@ -86,27 +115,20 @@ def _parse_block_ttb(text: str, conf: Dict[str, Any]) -> pd.DataFrame:
     max_gap = (cfg.get("group_by") or {}).get("max_gap_lines", 3)
     rows = []
     lines = [ln.strip() for ln in text.splitlines()]
+    n = len(lines)
+    # 필드별 '다음 매치 줄' 표를 한 번 만들어 두고, 시작 줄마다 앞으로 다시 훑지 않음
+    #   (j부터 max_gap줄 이내 첫 매치 = nxt[j], 범위 밖이면 실패 — 기존 while 탐색과 동일)
+    nexts = [_next_hit_index(lines, fr.get(field)) for field in order]
     i = 0
-    while i < len(lines):
+    while i < n:
         j = i; rec = {}
         ok = True
-        for field in order:
-            pat = fr.get(field)
-            found = False
-            span = 0
-            while j < len(lines) and span <= max_gap:
-                if pat:
-                    try:
-                        if re.search(pat, lines[j]):
-                            rec[field] = lines[j]
-                            found = True
-                            j += 1
-                            break
-                    except re.error:
-                        pass
-                j += 1; span += 1
-            if not found:
+        for field, nxt in zip(order, nexts):
+            k = nxt[j] if j < n else n
+            if k >= n or k - j > max_gap:
                 ok = False; break
+            rec[field] = lines[k]
+            j = k + 1
         if ok:
             rows.append(dict(
                 name=rec.get("name","").strip(),
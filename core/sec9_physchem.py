@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 import re
+from functools import lru_cache
 import pandas as pd
 from typing import List, Dict, Tuple, Optional
 
@@ -52,6 +53,25 @@ KEY_ALIASES: Dict[str, List[str]] = {
 # 라벨 후보 전체(순서 유지) — 매칭 우선순위에 영향
 ALL_LABELS: List[str] = [lab for labs in KEY_ALIASES.values() for lab in labs]
 
+# 라인 파서용 사전 계산 — 줄마다 라벨 수만큼 정규식을 새로 만들지 않도록
+_ALIAS_LOWER: List[Tuple[str, str, str]] = [(k, a, a.lower().strip()) for k, labs in KEY_ALIASES.items() for a in labs]
+_LABELS_LOWER: List[Tuple[str, str]] = [(lab, lab.lower()) for lab in ALL_LABELS]
+# 라벨 후보 중 하나라도 포함되면 매치(긴 라벨 우선은 불필요 — 존재 여부만 봄)
+_LABEL_ANY_RX = re.compile("|".join(re.escape(c) for _, c in _LABELS_LOWER))
+_MIN_LABEL_LEN = min(len(c) for _, c in _LABELS_LOWER)
+# 문두 라벨 탐색용: 첫 글자별 후보(원래 순서 유지) — 줄마다 전체 라벨을 startswith로 훑지 않도록
+_LABELS_BY_HEAD: Dict[str, List[Tuple[str, str]]] = {}
+for _lab, _c in _LABELS_LOWER:
+    _LABELS_BY_HEAD.setdefault(_c[:1], []).append((_lab, _c))
+del _lab, _c
+_WS_RUN_RX = re.compile(r"\s+")
+_MULTISPACE_RX = re.compile(r"\s{2,}")
+_NL_JOIN_RX = re.compile(r"[ \t]*\n[ \t]*")
+_COLON_RX = re.compile(r"[:：]")
+_COLON_END_RX = re.compile(r"[:：]\s*$")
+_NL_RX = re.compile(r"\r?\n")
+_LABEL_CHAR_FIX = str.maketrans({"：": ":", "–": "-", "—": "-"})
+
 # 공통 숫자/단위 패턴
 NUM = r"[+-]?(?:\d{1,3}(?:,\d{3})*|\d+)(?:\.\d+)?"
 UNIT = r"(?:°C|℃|K|Pa|kPa|MPa|mmHg|cSt|mPa·s|%|g/cm³|kg/m³|mg/L|mg\/l|mg·L-1|W\/m·K|s|min|h|atm|bar|g\/mol|mol\/L|kg\/L)"
@@ -116,9 +136,11 @@ def _try_table_extract_with_camelot(pdf_path: str, pages: List[int]) -> pd.DataF
                 df = t.df.replace("\n", " ", regex=True)
                 # 키/값 2열 or 다열 정리
                 if df.shape[1] >= 2:
-                    for _, row in df.iterrows():
-                        label = str(row.iloc[0]).strip()
-                        value = " ".join([str(x).strip() for x in row.iloc[1:].tolist() if str(x).strip() != ""]).strip()
+                    # 행마다 Series를 만드는 iterrows 대신 값 리스트를 한 번에 — 셀은 1회만 str/strip
+                    for row in df.values.tolist():
+                        cells = [str(x).strip() for x in row]
+                        label = cells[0]
+                        value = " ".join([c for c in cells[1:] if c])
                         if not (label or value):
                             continue
                         out.append({"label": label, "value": value})
@@ -142,19 +164,18 @@ def _merge_table_candidates(pdf_path: str, pages: List[int]) -> pd.DataFrame:
 
 def _normalize_label(s: str) -> str:
     t = (s or "").strip()
-    t = re.sub(r"\s+", " ", t)
-    t = t.replace("：", ":").replace("–","-").replace("—","-")
+    t = _WS_RUN_RX.sub(" ", t)
+    t = t.translate(_LABEL_CHAR_FIX)
     return t
 
+@lru_cache(maxsize=4096)
 def _label_to_key(label: str) -> Tuple[str,str]:
     lab = (label or "").strip().lower()
-    # alias 매핑
-    for key, aliases in KEY_ALIASES.items():
-        for a in aliases:
-            a_clean = a.lower().strip()
-            # 완전 포함 또는 단어 경계 기반 느슨 매칭
-            if a_clean in lab or re.search(rf"(?i)\b{re.escape(a_clean)}\b", lab):
-                return key, a
+    # 라벨은 문서 간 반복이 잦아 결과를 캐시(별칭 순서가 우선순위라 alternation 1회로는 대체 불가)
+    # alias 매핑 — 단어 경계 매치는 부분 포함에 항상 포함되므로 포함 검사만으로 충분
+    for key, a, a_clean in _ALIAS_LOWER:
+        if a_clean in lab:
+            return key, a
     # 못 찾으면 원라벨 유지
     return "other", label
 
@@ -163,41 +184,39 @@ def _clean_value(v: str) -> str:
         return v
     x = v.strip()
     # 줄바꿈/중복 공백 정리
-    x = re.sub(r"[ \t]*\n[ \t]*", " ", x)
-    x = re.sub(r"\s{2,}", " ", x)
+    x = _NL_JOIN_RX.sub(" ", x)
+    x = _MULTISPACE_RX.sub(" ", x)
     return x
 
-def _is_label_line(line: str) -> bool:
+def _is_label_line(line: str, norm: Optional[str] = None) -> bool:
     if not line:
         return False
-    L = _normalize_label(line).lower()
-    # 라벨 후보가 line에 들어있으면 라벨로 간주
-    for cand in ALL_LABELS:
-        c = cand.lower()
-        if c in L or re.search(rf"(?i)\b{re.escape(c)}\b", L):
-            return True
+    L = (_normalize_label(line) if norm is None else norm).lower()
+    # 라벨 후보가 line에 들어있으면 라벨로 간주(단일 alternation 1회 검색, 짧은 줄은 생략)
+    if len(L) >= _MIN_LABEL_LEN and _LABEL_ANY_RX.search(L):
+        return True
     # 콜론 기준도 라벨 신호
-    if re.search(r"[:：]\s*$", line):
+    if _COLON_END_RX.search(line):
         return True
     return False
 
-def _split_label_value_inline(line: str) -> Optional[Tuple[str,str]]:
+def _split_label_value_inline(line: str, norm: Optional[str] = None) -> Optional[Tuple[str,str]]:
     """
     가로형: '라벨 값' 형태 탐지. 라벨 키워드가 먼저 나오고 값이 뒤따르는 경우.
     예) '색상 무색, 흰색'  '비중 2.16'  'pH 5.0~8.0'
     """
-    s = _normalize_label(line)
+    s = _normalize_label(line) if norm is None else norm
     # 콜론 분리 우선
     if ":" in s or "：" in s:
-        parts = re.split(r"[:：]", s, maxsplit=1)
+        parts = _COLON_RX.split(s, maxsplit=1)
         lab = parts[0].strip()
         val = parts[1].strip()
         if lab and val:
             return lab, val
     # 콜론이 없어도 라벨 키워드 이후를 값으로 간주
-    for lab_cand in ALL_LABELS:
-        idx = s.lower().find(lab_cand.lower())
-        if idx == 0:  # 문두에 라벨이 온 경우
+    low = s.lower()
+    for lab_cand, c in _LABELS_BY_HEAD.get(low[:1], ()):
+        if low.startswith(c):  # 문두에 라벨이 온 경우
             lab = s[:len(lab_cand)].strip()
             val = s[len(lab_cand):].strip(" -–—\t")
             if val:
@@ -216,19 +235,28 @@ def _parse_lines_mixed(sec9_text: str) -> pd.DataFrame:
       비중 2.16
     이 혼재된 블록을 모두 처리.
     """
-    lines = [ln.strip() for ln in re.split(r"\r?\n", sec9_text)]
+    lines = [ln.strip() for ln in _NL_RX.split(sec9_text)]
     lines = [ln for ln in lines if ln is not None]
+    # 같은 줄을 가로형 분리·라벨 판정(바깥/안쪽 루프)에서 반복 정규화하지 않도록 줄별 1회
+    norms = [_normalize_label(ln) for ln in lines]
+    label_memo: Dict[int, bool] = {}
+
+    def is_label(k: int) -> bool:
+        hit = label_memo.get(k)
+        if hit is None:
+            hit = label_memo[k] = _is_label_line(lines[k], norms[k])
+        return hit
 
     out = []
     i = 0
     while i < len(lines):
-        line = lines[i].strip()
+        line = lines[i]
         if not line:
             i += 1
             continue
 
         # 3a) 먼저 가로형 시도
-        iv = _split_label_value_inline(line)
+        iv = _split_label_value_inline(line, norms[i])
         if iv:
             lab, val = iv
             key, matched_label = _label_to_key(lab)
@@ -238,19 +266,19 @@ def _parse_lines_mixed(sec9_text: str) -> pd.DataFrame:
                 continue
 
         # 3b) 세로형: 현재 줄이 라벨이고, 다음 줄이 값일 수 있음
-        if _is_label_line(line):
+        if is_label(i):
             lab = line
             nxt_val = ""
             # 값 후보: 다음 줄(비어있으면 그 다음) – 괄호로 이어지는 보조줄도 함께 묶음
             j = i + 1
             collected = []
             while j < len(lines):
-                cand = lines[j].strip()
+                cand = lines[j]
                 if not cand:
                     j += 1
                     continue
                 # 다음 라벨이 오면 종료
-                if _is_label_line(cand):
+                if is_label(j):
                     break
                 collected.append(cand)
                 # 값은 1~2줄 정도만 묶고 종료(과한 흡수 방지)
@@ -281,11 +309,15 @@ def _parse_lines_mixed(sec9_text: str) -> pd.DataFrame:
 
 # 4) 외부 API --------------------------------------------------------------------
 
+# 표 결과를 '충분'으로 보는 최소 행 수(임계는 느슨하게)
+SEC9_MIN_ROWS = 5
+
 def extract_physchem_sec9(pdf_path: str, pages: List[int], sec9_text: str) -> pd.DataFrame:
     """
     섹션9 물리·화학적 특성 추출:
       1) 페이지 범위 표 추출(pdfplumber → camelot)
       2) 실패 시 라인 파서(세로/가로 혼합)
+    표가 있으면 항상 표 우선 — 라인 파서는 행 수가 같아도 값에 다음 라벨·쪽번호가 섞이는 경우가 있음.
     반환 컬럼: key, label, value
     """
     # 1) 표 우선
@@ -297,7 +329,7 @@ def extract_physchem_sec9(pdf_path: str, pages: List[int], sec9_text: str) -> pd
         df_tab["value"] = df_tab["value"].map(_clean_value)
         df_tab = df_tab[(df_tab["value"].astype(str).str.len() > 0)]
         # 테이블에서 얻은 게 충분하면 반환
-        if len(df_tab) >= 5:  # 임계는 느슨하게
+        if len(df_tab) >= SEC9_MIN_ROWS:
             return df_tab[["key","label","value"]].drop_duplicates().reset_index(drop=True)
 
     # 2) 라인 파서(세로/가로 혼용)
@@ -1,27 +1,37 @@
 # -*- coding: utf-8 -*-
 import re
 import unicodedata
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 from typing import Dict, List, Tuple
 import pandas as pd
 
 # -----------------------------
 # 0) 정규화 유틸
 # -----------------------------
+_LINE_EDGE_WS_RE = re.compile(r"[ \t]*\n[ \t]*")
+_INLINE_WS_RE    = re.compile(r"[ \t]{2,}")
+_WS_RE           = re.compile(r"\s+")
+_KEY_NO_RE       = re.compile(r"(\d+)_")
+# 문자 1:1 치환(공백·콜론·대시·가운뎃점) — replace 체인 대신 translate 1회
+_CHAR_FIX = str.maketrans({
+    "\xa0": " ", "：": ":",
+    "‐": "-", "–": "-", "—": "-",
+    "・": "·", "∙": "·", "•": "·", "ㆍ": "·",
+})
+
 def normalize_text(s: str) -> str:
     if not s:
         return ""
-    s = unicodedata.normalize("NFKC", s)
-    s = (s
-         .replace("\xa0", " ")
-         .replace("：", ":")
-         .replace("‐", "-").replace("–", "-").replace("—", "-")
-         .replace("・", "·").replace("∙", "·").replace("•", "·").replace("ㆍ", "·"))
+    if not s.isascii():  # ASCII는 NFKC 불변
+        s = unicodedata.normalize("NFKC", s)
+    s = s.translate(_CHAR_FIX)
     # 흔한 오탈자/분리
     s = s.replace("규졔", "규제")
     # 줄 양쪽 공백 정리
-    s = re.sub(r"[ \t]*\n[ \t]*", "\n", s)
+    s = _LINE_EDGE_WS_RE.sub("\n", s)
     # 문장 내 중복 공백 최소화(개행은 유지)
-    s = re.sub(r"[ \t]{2,}", " ", s)
+    s = _INLINE_WS_RE.sub(" ", s)
     return s
 
 # -----------------------------
@@ -81,6 +91,18 @@ def build_patterns(k: str) -> List[str]:
 
 SECTION_PATTERNS: Dict[str, List[str]] = {k: build_patterns(k) for k in KW.keys()}
 
+def _compile_all(pats: List[str]) -> List["re.Pattern"]:
+    """우선순위 순서 유지하며 1회 컴파일(잘못된 패턴은 제외)."""
+    out = []
+    for p in pats:
+        try:
+            out.append(re.compile(p, re.I | re.M))
+        except re.error:
+            continue
+    return out
+
+SECTION_PATTERNS_C: Dict[str, List["re.Pattern"]] = {k: _compile_all(v) for k, v in SECTION_PATTERNS.items()}
+
 # -----------------------------
 # 2) 다음 섹션 경계 키워드(종료 감지용, 숫자 없이도 자르도록)
 # -----------------------------
@@ -124,17 +146,21 @@ NEXT_HINTS = {
     "16_other_information": [],
 }
 
+# 종료 힌트는 섹션 키별로 한 번만 컴파일(파일마다 f-string 패턴을 다시 만들지 않음)
+NEXT_HINTS_C: Dict[str, List["re.Pattern"]] = {
+    key: [re.compile(rf"(?m)^\s*(?:{SECWORD})?{NUM}{SEP}.*{hint_pat}.*$|^\s*{hint_pat}.*$", re.I)
+          for hint_pat, _next in hints]
+    for key, hints in NEXT_HINTS.items()
+}
+
 PAGE_MARK_RE = re.compile(r"----\s*PAGE\s+(\d+)\s*----", re.I)
 
 # -----------------------------
 # 3) 내부 유틸
 # -----------------------------
-def _find_first(patterns: List[str], text: str):
-    for p in patterns:
-        try:
-            m = re.search(p, text, re.I | re.M)
-        except re.error:
-            m = None
+def _find_first(patterns: List["re.Pattern"], text: str):
+    for rx in patterns:
+        m = rx.search(text)
         if m:
             return m
     return None
@@ -146,8 +172,8 @@ def _cut_by_next_hints(text: str, start_offset: int, key: str) -> int:
     """
     body = text[start_offset:]
     best = None
-    for hint_pat, _next in NEXT_HINTS.get(key, []):
-        m = re.search(rf"(?m)^\s*(?:{SECWORD})?{NUM}{SEP}.*{hint_pat}.*$|^\s*{hint_pat}.*$", body, re.I)
+    for rx in NEXT_HINTS_C.get(key, ()):
+        m = rx.search(body)
         if m:
             cand = start_offset + m.start()
             if best is None or cand < best:
@@ -170,7 +196,7 @@ def split_sections(text: str) -> Tuple[Dict, List[str], List[str], Dict[str, str
 
     text_norm = normalize_text(text)
     hits = []
-    for key, pats in SECTION_PATTERNS.items():
+    for key, pats in SECTION_PATTERNS_C.items():
         m = _find_first(pats, text_norm)
         if m:
             hits.append((m.start(), m.end(), key, m.group(0)))
@@ -214,7 +240,7 @@ def sections_overview_df(sections: Dict) -> pd.DataFrame:
     rows = []
     for k, v in sections.items():
         rows.append({
-            "title": re.sub(r"\s+", " ", (v.get("title") or "")).strip()[:120],
+            "title": _WS_RE.sub(" ", (v.get("title") or "")).strip()[:120],
             "key": k,
             "start": v.get("start", -1),
             "end": v.get("end", -1),
@@ -223,20 +249,32 @@ def sections_overview_df(sections: Dict) -> pd.DataFrame:
     df = pd.DataFrame(rows)
     if not df.empty:
         def _ord(x):
-            m = re.match(r"(\d+)_", str(x) or "")
+            m = _KEY_NO_RE.match(str(x) or "")
             return int(m.group(1)) if m else 999
         df = df.sort_values(by="key", key=lambda s: s.map(_ord)).reset_index(drop=True)
     return df
 
-def pages_for_span_from_markers(full_text: str, start: int, end: int):
-    pages, marks = [], []
+@lru_cache(maxsize=32)
+def page_offsets(full_text: str) -> Tuple[Tuple[int, ...], Tuple[int, ...], Tuple[int, ...]]:
+    """
+    페이지 마커 위치 → (구간 시작, 구간 끝, 페이지 번호). 문서당 1회만 스캔.
+    같은 full_text로 섹션별 여러 번 호출되므로 캐시(str 해시는 객체에 보관됨).
+    """
+    starts, pnos = [], []
     for m in PAGE_MARK_RE.finditer(full_text):
-        marks.append((m.start(), int(m.group(1))))
-    if not marks:
-        return pages
-    marks.append((len(full_text) + 1, marks[-1][1] + 1))
-    for i in range(len(marks) - 1):
-        seg_s, pno = marks[i]; seg_e, _ = marks[i + 1]
-        if max(seg_s, start) < min(seg_e, end):
-            pages.append(pno)
-    return sorted(set(pages))
+        starts.append(m.start())
+        pnos.append(int(m.group(1)))
+    ends = starts[1:] + [len(full_text) + 1]
+    return tuple(starts), tuple(ends), tuple(pnos)
+
+def pages_for_span(offsets, start: int, end: int) -> List[int]:
+    """[start, end)와 겹치는 페이지 번호 — 이분 탐색으로 O(log P)."""
+    starts, ends, pnos = offsets
+    if not starts or start >= end:
+        return []
+    lo = bisect_right(ends, start)   # 구간 끝이 start 이후인 첫 페이지
+    hi = bisect_left(starts, end)    # 구간 시작이 end 이전인 마지막 페이지 + 1
+    return sorted(set(pnos[lo:hi]))
+
+def pages_for_span_from_markers(full_text: str, start: int, end: int):
+    return pages_for_span(page_offsets(full_text or ""), start, end)
@@ -6,6 +6,7 @@
 from __future__ import annotations
 import io
 import os
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple
 
 # PyMuPDF
@@ -145,21 +146,53 @@ def _ocr_paddle_images(images: List[Image.Image]) -> List[str]:
     return results
 
 
+def _ocr_tesseract_one(img, lang: str) -> str:
+    if img is None:
+        return ""
+    try:
+        return (pytesseract.image_to_string(img, lang=lang) or "").strip()
+    except Exception:
+        return ""
+
+
+# tesseract 동시 실행 수 상한(환경변수). 없으면 min(8, CPU 수)
+OCR_THREADS_ENV = "MSDS_OCR_THREADS"
+
+
+def ocr_pool_worker_init(parent_workers: int) -> None:
+    """
+    프로세스 풀 워커 initializer — 워커마다 OCR 스레드를 CPU 수/워커 수로 제한하고
+    tesseract 내부 OpenMP 스레드도 1개로 고정(워커 수 × 페이지 스레드 × OpenMP 과다 구독 방지).
+    """
+    os.environ[OCR_THREADS_ENV] = str(max(1, (os.cpu_count() or 1) // max(1, parent_workers)))
+    os.environ["OMP_THREAD_LIMIT"] = "1"
+
+
+def _ocr_thread_count(n_images: int) -> int:
+    try:
+        cap = int(os.environ.get(OCR_THREADS_ENV) or 0)
+    except ValueError:
+        cap = 0
+    if cap <= 0:
+        cap = min(8, os.cpu_count() or 1)
+    return max(1, min(cap, n_images))
+
+
 def _ocr_tesseract_images(images: List[Image.Image], lang: str = "kor+eng") -> List[str]:
-    """pytesseract로 이미지 목록 OCR."""
+    """
+    pytesseract로 이미지 목록 OCR.
+    페이지마다 tesseract 서브프로세스를 띄우고 대기(GIL 해제) → 스레드로 동시 실행.
+    동시 실행 수는 MSDS_OCR_THREADS(프로세스 풀 워커에서는 ocr_pool_worker_init이 설정)로 제한.
+    tesseract의 OpenMP 스레드 수(OMP_THREAD_LIMIT)는 여기서 바꾸지 않음 — 풀 워커 initializer나
+    앱 시작 코드(또는 사용자 환경)에서 지정.
+    """
     if not _HAS_TESS:
         return ["" for _ in images]
-    out: List[str] = []
-    for img in images:
-        if img is None:
-            out.append("")
-            continue
-        try:
-            txt = pytesseract.image_to_string(img, lang=lang) or ""
-        except Exception:
-            txt = ""
-        out.append(txt.strip())
-    return out
+    workers = _ocr_thread_count(len(images))
+    if workers <= 1:
+        return [_ocr_tesseract_one(img, lang) for img in images]
+    with ThreadPoolExecutor(max_workers=workers) as tp:
+        return list(tp.map(_ocr_tesseract_one, images, [lang] * len(images)))
 
 
 def _need_ocr(page_text: str, min_chars: int = 16) -> bool:
@@ -5,6 +5,7 @@
 # - clamp_0_100가 True면 %, 0~100 범위만 허용(값/범위 모두)
 
 import re
+from functools import lru_cache
 from typing import List, Tuple, Dict, Any, Optional
 import pandas as pd
 
@@ -21,6 +22,19 @@ RX_RANGE_LOOSE = re.compile(rf"(?P<low>{CONC_VAL})\s*(?:[-–~∼]\s*|to\s+)(?P<
 RX_CMP_LOOSE   = re.compile(rf"(?P<cmp><=|>=|<|>|≤|≥)\s*(?P<value>{CONC_VAL})(?!\s*-\s*\d)", re.I)
 RX_SINGLE_LOOSE= re.compile(rf"(?P<value>{CONC_VAL})(?!\s*-\s*\d)", re.I)
 
+# 표 헤더 기본 추정 / 라인 파싱용 — 열·줄마다 패턴 문자열로 재조회하지 않도록 미리 컴파일
+RX_HDR_NAME = re.compile(r"(화학물질명|물질명|품명|Name|Substance|Component|Ingredient|Chemical)", re.I)
+RX_HDR_CAS  = re.compile(r"(CAS|식별번호?)", re.I)
+RX_HDR_CONC = re.compile(r"(함유|농도|content|conc|weight\s*%)", re.I)
+RX_EXPOSURE_LINE = re.compile(r"(?i)\\b(국내기준|ACGIH|TWA|STEL|노출기준)\\b")
+RX_MULTI_WS = re.compile(r"\s{2,}")
+
+
+@lru_cache(maxsize=None)
+def _alias_rx(cands: tuple) -> re.Pattern:
+    """헤더 별칭 목록 → 대소문자 무시 alternation 1개(별칭 중 하나라도 포함되면 매치)."""
+    return re.compile("|".join(re.escape(c) for c in cands), re.I)
+
 
 def _tofloat(x):
     try:
@@ -214,19 +228,15 @@ def _rows_from_table_df(
     def _pick_col_by_alias(cands: Optional[List[str]]) -> Optional[str]:
         if not cands:
             return None
-        for c in df2.columns:
-            sc = str(c)
-            for cand in cands:
-                if re.search(re.escape(cand), sc, re.I):
-                    return c
-        return None
+        rx = _alias_rx(tuple(cands))
+        return next((c for c in df2.columns if rx.search(str(c))), None)
 
     col_name = _pick_col_by_alias((table_header_aliases or {}).get("name")) \
-        or next((c for c in df2.columns if re.search(r"(화학물질명|물질명|품명|Name|Substance|Component|Ingredient|Chemical)", str(c), re.I)), None)
+        or next((c for c in df2.columns if RX_HDR_NAME.search(str(c))), None)
     col_cas  = _pick_col_by_alias((table_header_aliases or {}).get("cas")) \
-        or next((c for c in df2.columns if re.search(r"(CAS|식별번호?)", str(c), re.I)), None)
+        or next((c for c in df2.columns if RX_HDR_CAS.search(str(c))), None)
     col_conc = _pick_col_by_alias((table_header_aliases or {}).get("conc")) \
-        or next((c for c in df2.columns if re.search(r"(함유|농도|content|conc|weight\s*%)", str(c), re.I)), None)
+        or next((c for c in df2.columns if RX_HDR_CONC.search(str(c))), None)
 
     cas_re = cas_regex or CAS_RE_DEFAULT
 
@@ -237,7 +247,7 @@ def _rows_from_table_df(
             conc = ""
 
         cas = ""
-        cas_m = re.search(cas_re, " ".join([str(x) for x in r.tolist()]))
+        cas_m = cas_re.search(" ".join([str(x) for x in r.tolist()]))
         if cas_m:
             cas = cas_m.group(1)
         if not cas:
@@ -346,11 +356,11 @@ def _line_parse(
     cas_re = cas_regex or CAS_RE_DEFAULT
 
     for i, ln in enumerate(src):
-        cas_iter = list(re.finditer(cas_re, ln))
+        cas_iter = list(cas_re.finditer(ln))
         if not cas_iter:
             continue
         
-        if re.search(r"(?i)\\b(국내기준|ACGIH|TWA|STEL|노출기준)\\b", ln):
+        if RX_EXPOSURE_LINE.search(ln):
             continue
           
         prev_ln = src[i - 1] if i - 1 >= 0 else ""
@@ -359,7 +369,7 @@ def _line_parse(
         for m in cas_iter:
             cas = m.group(1)
             name = ln[:m.start()].strip(" -:\t|·•")
-            name = re.sub(r"\s{2,}", " ", name)
+            name = RX_MULTI_WS.sub(" ", name)
 
             conc = (_pick_conc(ln, cas, injected_patterns=injected_patterns, unit_default_when_missing=post_unit_default)
                     or _pick_conc(next_ln, cas, injected_patterns=injected_patterns, unit_default_when_missing=post_unit_default)
@@ -0,0 +1,57 @@
+# test/golden/check_sec9_order.py
+# 샘플 PDF → 상세보기 섹션9가 벤더 prefer_text_first 설정과 무관하게 표 우선 결과와 같은지 확인
+#   (라인 파서 우선으로 바꾸면 행 수가 줄고 값에 다음 라벨·쪽번호가 섞이던 회귀 방지)
+import os
+import sys
+import glob
+
+sys.path.append(os.path.abspath("."))
+
+from core.text_io import read_pdf_text
+from core.section_splitter import split_sections, pages_for_span_from_markers
+from core.vendor_loader import load_vendor_yamls, pick_vendor_auto
+from core.batch_pipeline import detail_tables
+from core.sec9_physchem import extract_physchem_sec9
+
+
+def eval_one(pdf_path: str, cfgs: dict):
+    text = read_pdf_text(pdf_path)
+    sections = split_sections(text)[0]
+    route, _ = pick_vendor_auto(text, cfgs)
+    cfg = cfgs.get(route, {}) or {}
+
+    sec9 = sections.get("9_physical_chemical")
+    if not sec9:
+        return True, 0, 0
+    sec9_text = sec9.get("text", "") or ""
+    pages = pages_for_span_from_markers(text, sec9["header_span"][0], sec9["end"])
+
+    ref = extract_physchem_sec9(pdf_path, pages, sec9_text)
+    got = []
+    for flag in (True, False):
+        c = dict(cfg); c["tables"] = dict(cfg.get("tables", {}) or {}, prefer_text_first=flag)
+        got.append(detail_tables(pdf_path, "", [], sec9_text, pages, c)[1])
+    same = all(g.equals(ref) for g in got)
+    return same, len(ref), len(got[0])
+
+
+def main():
+    base = "msds/msds"
+    pdfs = sorted(glob.glob(os.path.join(base, "*.pdf")))
+    if not pdfs:
+        print(f"[sec9] no pdfs in {base}"); return
+    cfgs = load_vendor_yamls("templates/vendors")
+    ok = 0
+    for p in pdfs:
+        same, n_ref, n_got = eval_one(p, cfgs)
+        name = os.path.basename(p)
+        if same:
+            ok += 1
+        else:
+            print(f"[DIFF] {name}: table-first {n_ref} rows, pipeline {n_got} rows")
+    print(f"[summary] {ok}/{len(pdfs)} matched")
+    if ok != len(pdfs):
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()